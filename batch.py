@@ -0,0 +1,226 @@
+"""
+Headless batch entry point for PDF Combiner application
+
+Usage:
+    python batch.py <dossier_ou_pdf> [...] -o <dossier_sortie> [-w 4] [-f PDF]
+    python batch.py <pdf_multipages> [...] -o <dossier_sortie> --multipage
+    python batch.py <dossier_entree> -o <dossier_sortie> --watch [--pair-pattern REGEX]
+    python batch.py <dossier_etiquettes_a6> -o <dossier_sortie> --layout a6-4up
+    python batch.py <dossier_ou_pdf> [...] -o <dossier_sortie> --single-file etiquettes
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from src.config import config
+from src.core import (
+    BatchProcessor,
+    FolderWatcher,
+    LAYOUT_PRESETS,
+    pair_pdf_files,
+    make_document_jobs,
+    make_sheet_jobs,
+    format_stage_breakdown,
+    is_inotify_available
+)
+from src.models import ExportConfig, Orientation
+from src.exceptions import PDFCombinerError
+from src.utils import collect_pdf_files
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Combine des paires de PDF sans interface graphique"
+    )
+    parser.add_argument(
+        "inputs", nargs="+",
+        help="Fichiers PDF ou dossiers (appariés deux par deux dans l'ordre)"
+    )
+    parser.add_argument(
+        "-o", "--output", required=True,
+        help="Dossier de sortie"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None,
+        help="Nombre de processus (défaut: un par CPU)"
+    )
+    parser.add_argument(
+        "-f", "--format", default=config.DEFAULT_EXPORT_FORMAT,
+        choices=config.SUPPORTED_FORMATS,
+        help="Format d'export"
+    )
+    parser.add_argument(
+        "--multipage", action="store_true",
+        help="Une étiquette par page: les pages consécutives de chaque PDF sont appariées"
+    )
+    parser.add_argument(
+        "--layout", default="halves", choices=sorted(LAYOUT_PRESETS),
+        help="Imposition: 'halves' combine les moitiés de deux PDF (défaut), "
+             "'a6-4up' place quatre étiquettes A6 par feuille A4 (orientation1 pour toutes les pages)"
+    )
+    parser.add_argument(
+        "--single-file", metavar="NOM", default=None,
+        help="Écrit toutes les planches, dans l'ordre, dans un seul fichier multipage NOM "
+             "(PDF, PDF-G4 ou TIFF-G4, toujours rastérisé)"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Surveille le dossier d'entrée et combine les PDF au fil de leur arrivée (Ctrl+C pour arrêter)"
+    )
+    parser.add_argument(
+        "--pair-pattern", default=None,
+        help="Mode surveillance: regex appariant les fichiers dont le groupe 'key' est identique "
+             "(défaut: par ordre d'arrivée)"
+    )
+    parser.add_argument(
+        "--trace-log", default=None,
+        help="Fichier JSON lines des temps par étape"
+    )
+    parser.add_argument(
+        "--orientation1", default=Orientation.AUTO.value,
+        choices=[orientation.value for orientation in Orientation],
+        help="Orientation du premier PDF de chaque paire (Auto: détectée sur chaque page)"
+    )
+    parser.add_argument(
+        "--orientation2", default=Orientation.AUTO.value,
+        choices=[orientation.value for orientation in Orientation],
+        help="Orientation du second PDF de chaque paire (Auto: détectée sur chaque page)"
+    )
+    return parser.parse_args(argv)
+
+
+def print_report(report) -> None:
+    """Print throughput, latency and stage breakdown of a run"""
+    print(f"Paires traitées: {len(report.succeeded)}/{len(report.results)} "
+          f"en {report.wall_time:.2f} s")
+    print(f"Débit: {report.jobs_per_second:.2f} paires/s")
+    print(f"Latence par paire: moyenne {report.mean_latency * 1000:.0f} ms, "
+          f"p50 {report.latency_percentile(50) * 1000:.0f} ms, "
+          f"p95 {report.latency_percentile(95) * 1000:.0f} ms, "
+          f"max {report.latency_percentile(100) * 1000:.0f} ms")
+    
+    stage_times = report.mean_stage_times()
+    if stage_times:
+        print(f"Étapes (moyenne par paire): {format_stage_breakdown(stage_times)}")
+
+
+def watch(args, export_config: ExportConfig) -> int:
+    """Run the watch mode until interrupted"""
+    if len(args.inputs) != 1:
+        print("Erreur: le mode surveillance attend un seul dossier d'entrée")
+        return 1
+    
+    try:
+        watcher = FolderWatcher(
+            args.inputs[0], args.output, export_config,
+            workers=args.workers,
+            pair_pattern=args.pair_pattern,
+            orientation1=Orientation(args.orientation1),
+            orientation2=Orientation(args.orientation2),
+            trace_log=args.trace_log
+        )
+    except PDFCombinerError as e:
+        print(f"Erreur: {e}")
+        return 1
+    
+    detection = "inotify" if is_inotify_available() else f"scrutation toutes les {watcher.poll_interval:g} s"
+    print(f"Surveillance de {args.inputs[0]} ({detection}), {watcher.workers} processus, "
+          f"file de {watcher.queue_size} paires. Ctrl+C pour arrêter.")
+    
+    def on_job_done(job, result):
+        names = " + ".join(os.path.basename(path) if path else config.BATCH_BLANK_NAME
+                           for path in (job.pdf1_path, job.pdf2_path))
+        if result.success:
+            print(f"✓ Paire #{result.job_id}: {names} ({result.latency * 1000:.0f} ms)")
+        else:
+            print(f"✗ Paire #{result.job_id}: {names}: {result.error}")
+    
+    # Ctrl+C stops scanning, the pairs already queued are still combined
+    signal.signal(signal.SIGINT, lambda signum, frame: watcher.stop())
+    watcher.run(on_job_done=on_job_done)
+    print("Surveillance arrêtée")
+    
+    print_report(watcher.report)
+    return 0 if not watcher.report.failed else 1
+
+
+def main(argv=None) -> int:
+    """Batch entry point"""
+    args = parse_args(argv)
+    
+    if args.layout != "halves" and (args.watch or args.multipage):
+        print(f"Erreur: la mise en page {args.layout} ne s'utilise pas avec --watch ou --multipage")
+        return 1
+    
+    if args.single_file and (args.watch or args.multipage):
+        print("Erreur: --single-file ne s'utilise pas avec --watch ou --multipage")
+        return 1
+    
+    if args.watch:
+        export_config = ExportConfig(
+            format_type=args.format,
+            quality=config.EXPORT_QUALITY,
+            dpi=config.EXPORT_DPI
+        )
+        return watch(args, export_config)
+    
+    try:
+        pdf_files = collect_pdf_files(args.inputs)
+        if args.layout != "halves":
+            jobs = make_sheet_jobs(pdf_files, args.layout, Orientation(args.orientation1))
+        else:
+            make_jobs = make_document_jobs if args.multipage else pair_pdf_files
+            jobs = make_jobs(
+                pdf_files,
+                Orientation(args.orientation1),
+                Orientation(args.orientation2)
+            )
+        export_config = ExportConfig(
+            format_type=args.format,
+            quality=config.EXPORT_QUALITY,
+            dpi=config.EXPORT_DPI
+        )
+        
+        processor = BatchProcessor(args.output, export_config, workers=args.workers,
+                                   trace_log=args.trace_log)
+        if args.multipage:
+            print(f"{len(pdf_files)} PDF multipages, {processor.workers} processus")
+        elif args.layout != "halves":
+            print(f"{len(pdf_files)} PDF, {len(jobs)} planches {args.layout}, {processor.workers} processus")
+        else:
+            print(f"{len(pdf_files)} PDF, {len(jobs)} paires, {processor.workers} processus")
+        
+        def on_job_done(result):
+            if not result.success:
+                pages = f" pages {result.pages}" if result.pages else ""
+                print(f"✗ Paire #{result.job_id}{pages}: {result.error}")
+        
+        if args.single_file:
+            report = processor.run_single_file(jobs, args.single_file, on_job_done=on_job_done)
+        else:
+            report = processor.run(jobs, on_job_done=on_job_done)
+    except PDFCombinerError as e:
+        print(f"Erreur: {e}")
+        return 1
+    except KeyboardInterrupt:
+        print("\nTraitement interrompu par l'utilisateur")
+        return 130
+    
+    # Final report
+    print_report(report)
+    return 0 if not report.failed else 1
+
+
+if __name__ == "__main__":
+    # Required for process pools in the frozen Windows executable
+    multiprocessing.freeze_support()
+    sys.exit(main())
\ No newline at end of file
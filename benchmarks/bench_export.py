@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'export PDF: chemin raster vs composition vectorielle
+
+Usage:
+    python benchmarks/bench_export.py <dossier_fixtures> [--renderer pdfium] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+root_path = Path(__file__).parent.parent
+sys.path.insert(0, str(root_path))
+
+from src.config import config
+from src.core import PDFProcessor, pair_pdf_files
+from src.core.vector_export import VectorPDFExporter, is_vector_export_available
+from src.models import ExportConfig
+from src.utils import collect_pdf_files, get_file_size
+
+
+def load_pair(job, render: bool) -> PDFProcessor:
+    """Load a pair of inputs into a fresh processor"""
+    processor = PDFProcessor()
+    for pdf_number, file_path in ((1, job.pdf1_path), (2, job.pdf2_path)):
+        if file_path:
+            processor.load_pdf_from_file(file_path, pdf_number, render=render)
+        else:
+            processor.load_blank_page(pdf_number)
+    return processor
+
+
+def bench_raster(jobs, output_dir: str) -> tuple:
+    """Render, combine and save as raster PDF; return (latencies, output bytes)"""
+    timings, sizes = [], []
+    export_config = ExportConfig(format_type="PDF", quality=config.EXPORT_QUALITY, dpi=config.EXPORT_DPI)
+    for job in jobs:
+        start = time.perf_counter()
+        processor = load_pair(job, render=True)
+        processor.process_combination()
+        
+        paths = []
+        for image, name in ((processor.combined.top_combined, "raster_top.pdf"),
+                            (processor.combined.bottom_combined, "raster_bottom.pdf")):
+            path = os.path.join(output_dir, name)
+            image.save(path, 'PDF', quality=export_config.quality, resolution=float(export_config.dpi))
+            paths.append(path)
+        
+        timings.append(time.perf_counter() - start)
+        sizes.append(sum(get_file_size(path) for path in paths))
+    return timings, sizes
+
+
+def bench_vector(jobs, output_dir: str) -> tuple:
+    """Compose vector PDFs from the sources; return (latencies, output bytes)"""
+    timings, sizes = [], []
+    top_path = os.path.join(output_dir, "vector_top.pdf")
+    bottom_path = os.path.join(output_dir, "vector_bottom.pdf")
+    for job in jobs:
+        start = time.perf_counter()
+        processor = load_pair(job, render=False)
+        VectorPDFExporter().export(processor.pdf1, processor.pdf2, top_path, bottom_path)
+        timings.append(time.perf_counter() - start)
+        sizes.append(get_file_size(top_path) + get_file_size(bottom_path))
+    return timings, sizes
+
+
+def main(argv=None) -> int:
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Compare l'export PDF raster et vectoriel")
+    parser.add_argument("fixtures", nargs="+", help="Fichiers PDF ou dossiers de fixtures")
+    parser.add_argument("--renderer", default=config.RENDERER_BACKEND, help="Backend de rendu du chemin raster")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    
+    config.RENDERER_BACKEND = args.renderer
+    config.RENDER_CACHE_ENABLED = False  # Measure real renders
+    
+    jobs = pair_pdf_files(collect_pdf_files(args.fixtures))
+    if not jobs:
+        print("❌ Aucun PDF trouvé")
+        return 1
+    
+    print(f"{len(jobs)} paires, {args.repeat} répétitions, rendu raster: {args.renderer}\n")
+    print(f"{'Export':<8} {'moyenne':>10} {'médiane':>10} {'taille moy.':>12}")
+    
+    benches = [("raster", bench_raster)]
+    if is_vector_export_available():
+        benches.append(("vector", bench_vector))
+    else:
+        print("vector   indisponible: pikepdf n'est pas installé")
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        for name, bench in benches:
+            timings, sizes = [], []
+            try:
+                for _ in range(args.repeat):
+                    run_timings, run_sizes = bench(jobs, output_dir)
+                    timings.extend(run_timings)
+                    sizes.extend(run_sizes)
+            except Exception as e:
+                print(f"{name:<8} erreur: {e}")
+                continue
+            
+            print(f"{name:<8} "
+                  f"{statistics.mean(timings) * 1000:>8.1f}ms "
+                  f"{statistics.median(timings) * 1000:>8.1f}ms "
+                  f"{statistics.mean(sizes) / 1024:>9.1f} Ko")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
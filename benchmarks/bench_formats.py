@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark des formats d'export: temps d'encodage et taille des fichiers
+
+Compare PDF (JPEG), PNG et les profils noir et blanc CCITT G4 (PDF-G4,
+TIFF-G4) sur les étiquettes synthétiques.
+
+Usage:
+    python benchmarks/bench_formats.py [--renderer pdfium] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+root_path = Path(__file__).parent.parent
+sys.path.insert(0, str(root_path))
+
+from benchmarks.fixtures import generate_fixtures
+from src.config import config
+from src.core import PDFProcessor
+from src.models import ExportConfig, Orientation
+from src.utils import get_file_size, save_image_with_format
+
+# Fixture name -> orientation used for both inputs
+FIXTURE_ORIENTATIONS = {
+    "portrait_vector": Orientation.PORTRAIT,
+    "landscape_vector": Orientation.LANDSCAPE,
+    "portrait_image": Orientation.PORTRAIT,
+}
+
+
+def combine_fixture(file_path: str, orientation: Orientation):
+    """Combine a fixture with itself and return the tops image"""
+    processor = PDFProcessor()
+    for pdf_number in (1, 2):
+        processor.load_pdf_from_file(file_path, pdf_number)
+        processor.set_orientation(pdf_number, orientation)
+    return processor.process_combination().top_combined
+
+
+def main(argv=None) -> int:
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Compare les formats d'export")
+    parser.add_argument("--renderer", default=config.RENDERER_BACKEND, help="Backend de rendu")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    
+    config.RENDERER_BACKEND = args.renderer
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fixtures = generate_fixtures(os.path.join(temp_dir, "fixtures"))
+        
+        for name, orientation in FIXTURE_ORIENTATIONS.items():
+            try:
+                image = combine_fixture(fixtures[name], orientation)
+            except Exception as e:
+                print(f"❌ {name}: {e}")
+                return 1
+            
+            print(f"\n{name} ({image.width}x{image.height})")
+            print(f"  {'Format':<8} {'médiane':>10} {'taille':>12} {'ratio':>8}")
+            
+            reference_size = None
+            for format_type in config.SUPPORTED_FORMATS:
+                file_path = os.path.join(temp_dir, ExportConfig(format_type=format_type).get_full_filename(True))
+                timings = []
+                try:
+                    for _ in range(args.repeat):
+                        start = time.perf_counter()
+                        save_image_with_format(image, file_path, format_type, config.EXPORT_QUALITY, config.EXPORT_DPI)
+                        timings.append(time.perf_counter() - start)
+                except Exception as e:
+                    print(f"  {format_type:<8} erreur: {e}")
+                    continue
+                
+                size = get_file_size(file_path)
+                reference_size = reference_size or size  # First format (PDF) is the reference
+                print(f"  {format_type:<8} "
+                      f"{statistics.median(timings) * 1000:>8.1f}ms "
+                      f"{size / 1024:>9.1f} Ko "
+                      f"{reference_size / size:>7.1f}x")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
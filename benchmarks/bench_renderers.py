@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark des backends de rendu (poppler vs pdfium)
+
+Usage:
+    python benchmarks/bench_renderers.py <dossier_fixtures> [--dpi 300] [--repeat 3] [--region half]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+root_path = Path(__file__).parent.parent
+sys.path.insert(0, str(root_path))
+
+from src.config import config
+from src.core.layout import plan_half_regions
+from src.core.renderers import RENDERERS, get_renderer
+from src.models import Orientation
+from src.exceptions import PDFCombinerError
+from src.utils import collect_pdf_files
+
+
+def bench_renderer(renderer, pdf_files, dpi: int, repeat: int, region: str = "full") -> list:
+    """Time one render per file, repeated, and return latencies in seconds"""
+    timings = []
+    for _ in range(repeat):
+        for file_path in pdf_files:
+            start = time.perf_counter()
+            if region == "half":
+                # Top half only, as used by region-of-interest rendering
+                width, height = renderer.get_page_size(file_path)
+                top_region, _ = plan_half_regions(width, height, Orientation.PORTRAIT)
+                renderer.render_region(file_path, dpi, 1, top_region.box)
+            else:
+                renderer.render(file_path, dpi, 1, 1)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main(argv=None) -> int:
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Compare les backends de rendu PDF")
+    parser.add_argument("fixtures", nargs="+", help="Fichiers PDF ou dossiers de fixtures")
+    parser.add_argument("--dpi", type=int, default=config.EXPORT_DPI)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--region", choices=["full", "half"], default="full",
+                        help="Page entière ou moitié haute seulement")
+    args = parser.parse_args(argv)
+    
+    pdf_files = collect_pdf_files(args.fixtures)
+    if not pdf_files:
+        print("❌ Aucun PDF trouvé")
+        return 1
+    
+    print(f"{len(pdf_files)} fixtures, {args.dpi} DPI, {args.repeat} répétitions, rendu: {args.region}\n")
+    print(f"{'Backend':<10} {'moyenne':>10} {'médiane':>10} {'min':>10} {'max':>10}")
+    
+    for name in RENDERERS:
+        try:
+            renderer = get_renderer(name)
+            timings = bench_renderer(renderer, pdf_files, args.dpi, args.repeat, args.region)
+        except PDFCombinerError as e:
+            print(f"{name:<10} indisponible: {e}")
+            continue
+        except Exception as e:
+            print(f"{name:<10} erreur: {e}")
+            continue
+        
+        print(f"{name:<10} "
+              f"{statistics.mean(timings) * 1000:>8.1f}ms "
+              f"{statistics.median(timings) * 1000:>8.1f}ms "
+              f"{min(timings) * 1000:>8.1f}ms "
+              f"{max(timings) * 1000:>8.1f}ms")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Benchmark par étape du pipeline sur des étiquettes synthétiques
+
+Mesure le rendu, l'orientation, la découpe, la combinaison, l'aperçu et
+l'enregistrement PDF/PNG, avec le pic mémoire de chaque étape. Le résultat
+JSON peut servir de référence pour détecter les régressions.
+
+Usage:
+    python benchmarks/bench_stages.py [--json resultats.json] [--baseline reference.json] [--threshold 0.2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add project root to path for imports
+root_path = Path(__file__).parent.parent
+sys.path.insert(0, str(root_path))
+
+import PIL
+
+from benchmarks.fixtures import generate_fixtures
+from src.config import config
+from src.core import PDFProcessor
+from src.core.compositor import compose_plan
+from src.core.layout import plan_combination, plan_half_regions
+from src.models import Orientation, SolidFill
+from src.utils import (
+    apply_orientation_transform,
+    combine_images_vertically,
+    extract_region,
+    resize_image_for_preview,
+    save_image_with_format
+)
+
+# Case name -> (fixture 1, orientation 1, fixture 2, orientation 2); None is a blank page
+CASES = {
+    "portrait_vector": ("portrait_vector", Orientation.PORTRAIT, "portrait_vector", Orientation.PORTRAIT),
+    "landscape_vector": ("landscape_vector", Orientation.LANDSCAPE, "landscape_vector", Orientation.LANDSCAPE),
+    "portrait_image": ("portrait_image", Orientation.PORTRAIT, "portrait_image", Orientation.PORTRAIT),
+    "landscape_image": ("landscape_image", Orientation.LANDSCAPE, "landscape_image", Orientation.LANDSCAPE),
+    "mixed_blank": ("portrait_vector", Orientation.PORTRAIT, None, Orientation.PORTRAIT),
+    "blank_page": ("blank", Orientation.PORTRAIT, "portrait_image", Orientation.PORTRAIT),
+}
+
+
+def _current_rss() -> Optional[int]:
+    """Resident set size in bytes, or None when it cannot be read"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class PeakMemory:
+    """Sample RSS in a background thread and keep the peak above the start value"""
+    
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.baseline = None
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def _sample(self) -> None:
+        while not self._stop.is_set():
+            rss = _current_rss()
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+            self._stop.wait(self.interval)
+    
+    def __enter__(self) -> "PeakMemory":
+        self.baseline = _current_rss()
+        self.peak = self.baseline
+        if self.baseline is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        rss = _current_rss()
+        if rss is not None:
+            self.peak = max(self.peak or 0, rss)
+    
+    @property
+    def peak_delta(self) -> Optional[int]:
+        """Peak memory above the starting RSS in bytes"""
+        if self.baseline is None:
+            return None
+        return self.peak - self.baseline
+
+
+class StageTimer:
+    """Collect latencies and peak memory per stage"""
+    
+    def __init__(self):
+        self.timings: Dict[str, List[float]] = {}
+        self.peaks: Dict[str, List[int]] = {}
+    
+    @contextmanager
+    def stage(self, name: str):
+        with PeakMemory() as memory:
+            start = time.perf_counter()
+            yield
+            elapsed = time.perf_counter() - start
+        self.timings.setdefault(name, []).append(elapsed)
+        if memory.peak_delta is not None:
+            self.peaks.setdefault(name, []).append(memory.peak_delta)
+    
+    def summary(self) -> Dict[str, dict]:
+        """Per stage statistics in milliseconds and megabytes"""
+        result = {}
+        for name, timings in self.timings.items():
+            peaks = self.peaks.get(name)
+            result[name] = {
+                "median_ms": round(statistics.median(timings) * 1000, 3),
+                "mean_ms": round(statistics.mean(timings) * 1000, 3),
+                "min_ms": round(min(timings) * 1000, 3),
+                "peak_mb": round(max(peaks) / 1024 / 1024, 2) if peaks else None,
+            }
+        return result
+
+
+def run_case(fixtures: Dict[str, str], case: tuple, output_dir: str, timer: StageTimer) -> None:
+    """Run every pipeline stage once for one pair of inputs"""
+    name1, orientation1, name2, orientation2 = case
+    processor = PDFProcessor()
+    for pdf_number, name, orientation in ((1, name1, orientation1), (2, name2, orientation2)):
+        if name:
+            processor.load_pdf_from_file(fixtures[name], pdf_number, render=False)
+        else:
+            processor.load_blank_page(pdf_number)
+        processor.set_orientation(pdf_number, orientation)
+    
+    with timer.stage("render"):
+        processor.load_hires_images()
+    source1, source2 = processor.pdf1.hires_image, processor.pdf2.hires_image
+    
+    # Legacy stages, kept separate to see where time goes; they need real pixels for blank pages
+    image1, image2 = (
+        source.to_image() if isinstance(source, SolidFill) else source
+        for source in (source1, source2)
+    )
+    with timer.stage("orientation"):
+        rotated = [
+            apply_orientation_transform(image, orientation.value)
+            for image, orientation in ((image1, orientation1), (image2, orientation2))
+        ]
+    del rotated
+    
+    with timer.stage("crop"):
+        halves = [
+            [extract_region(image, region.box, region.rotation)
+             for region in plan_half_regions(*image.size, orientation)]
+            for image, orientation in ((image1, orientation1), (image2, orientation2))
+        ]
+    
+    with timer.stage("combine"):
+        combined = [combine_images_vertically(halves[0][index], halves[1][index]) for index in (0, 1)]
+    del halves, combined
+    
+    # Production path: orientation, crop and combine fused in one plan
+    with timer.stage("compose"):
+        plans = plan_combination(source1.size, orientation1, source2.size, orientation2)
+        combined = [compose_plan(plan, (source1, source2)) for plan in plans]
+    
+    with timer.stage("preview"):
+        for image in (image1, image2, *combined):
+            resize_image_for_preview(image, config.PREVIEW_MAX_SIZE)
+    
+    with timer.stage("save_pdf"):
+        for index, image in enumerate(combined):
+            save_image_with_format(image, os.path.join(output_dir, f"out_{index}.pdf"), "PDF",
+                                   config.EXPORT_QUALITY, config.EXPORT_DPI)
+    
+    with timer.stage("save_png"):
+        for index, image in enumerate(combined):
+            save_image_with_format(image, os.path.join(output_dir, f"out_{index}.png"), "PNG",
+                                   config.EXPORT_QUALITY, config.EXPORT_DPI)
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float, min_ms: float) -> List[str]:
+    """List stages whose median latency or peak memory grew beyond threshold"""
+    regressions = []
+    for case, stages in results["cases"].items():
+        for stage, current in stages.items():
+            reference = baseline.get("cases", {}).get(case, {}).get(stage)
+            if not reference:
+                continue
+            
+            # Ignore sub-millisecond noise
+            if current["median_ms"] >= min_ms and current["median_ms"] > reference["median_ms"] * (1 + threshold):
+                regressions.append(f"{case}/{stage}: {reference['median_ms']:.1f}ms -> {current['median_ms']:.1f}ms")
+            
+            if current["peak_mb"] and reference.get("peak_mb"):
+                if current["peak_mb"] > reference["peak_mb"] * (1 + threshold) + 1:
+                    regressions.append(f"{case}/{stage}: {reference['peak_mb']:.1f}Mo -> {current['peak_mb']:.1f}Mo")
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark par étape du pipeline de combinaison")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--renderer", default=config.RENDERER_BACKEND, help="Backend de rendu")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), help="Cas à exécuter (tous par défaut)")
+    parser.add_argument("--fixtures-dir", help="Dossier où générer les fixtures (temporaire par défaut)")
+    parser.add_argument("--json", dest="json_path", help="Fichier JSON des résultats")
+    parser.add_argument("--baseline", help="Résultats JSON de référence")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Régression tolérée (0.2 = +20%%)")
+    parser.add_argument("--min-ms", type=float, default=2.0, help="Ignore les étapes plus rapides que ce seuil")
+    args = parser.parse_args(argv)
+    
+    config.RENDERER_BACKEND = args.renderer
+    config.RENDER_CACHE_ENABLED = False  # Measure real renders
+    config.LABEL_DETECTION = False  # Whole page halves, comparable with earlier baselines
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fixtures = generate_fixtures(args.fixtures_dir or os.path.join(temp_dir, "fixtures"))
+        
+        results = {
+            "python": platform.python_version(),
+            "pillow": PIL.__version__,
+            "platform": platform.platform(),
+            "renderer": args.renderer,
+            "export_dpi": config.EXPORT_DPI,
+            "repeat": args.repeat,
+            "cases": {},
+        }
+        
+        for case_name in args.cases or CASES:
+            timer = StageTimer()
+            try:
+                for _ in range(args.repeat):
+                    run_case(fixtures, CASES[case_name], temp_dir, timer)
+            except Exception as e:
+                print(f"❌ {case_name}: {e}")
+                return 1
+            results["cases"][case_name] = timer.summary()
+    
+    for case_name, stages in results["cases"].items():
+        print(f"\n{case_name}")
+        print(f"  {'Étape':<12} {'médiane':>10} {'min':>10} {'pic mém.':>10}")
+        for stage, stats in stages.items():
+            peak = f"{stats['peak_mb']:.1f} Mo" if stats["peak_mb"] is not None else "n/d"
+            print(f"  {stage:<12} {stats['median_ms']:>8.1f}ms {stats['min_ms']:>8.1f}ms {peak:>10}")
+    
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Résultats: {args.json_path}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold, args.min_ms)
+        if regressions:
+            print(f"\n❌ {len(regressions)} régression(s) au-delà de {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\n✅ Aucune régression au-delà de {args.threshold:.0%}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Génération locale d'étiquettes PDF synthétiques pour les benchmarks
+
+Usage:
+    python benchmarks/fixtures.py <dossier_sortie>
+"""
+
+import os
+import random
+import sys
+from typing import Dict, List, Tuple
+
+from PIL import Image, ImageDraw
+
+# A4 in points
+A4_PORTRAIT = (595.276, 841.89)
+A4_LANDSCAPE = (841.89, 595.276)
+
+# Fixture name -> (page size in points, kind)
+FIXTURES: Dict[str, Tuple[Tuple[float, float], str]] = {
+    "portrait_vector": (A4_PORTRAIT, "vector"),
+    "landscape_vector": (A4_LANDSCAPE, "vector"),
+    "portrait_image": (A4_PORTRAIT, "image"),
+    "landscape_image": (A4_LANDSCAPE, "image"),
+    "blank": (A4_PORTRAIT, "blank"),
+}
+
+
+def _barcode_ops(x: float, y: float, width: float, height: float, rng: random.Random) -> List[str]:
+    """Draw a barcode-like run of black bars"""
+    ops = []
+    position = x
+    while position < x + width:
+        bar = rng.choice((0.8, 1.6, 2.4))
+        ops.append(f"{position:.2f} {y:.2f} {bar:.2f} {height:.2f} re f")
+        position += bar + rng.choice((0.8, 1.6, 2.4))
+    return ops
+
+
+def _label_ops(width: float, height: float, seed: int) -> str:
+    """Content stream of two stacked shipping labels (one per half)"""
+    rng = random.Random(seed)
+    ops = ["0 g"]
+    for half in range(2):
+        # Each label sits in its own half of the page, like carrier labels
+        if width > height:
+            x0, y0, w, h = half * width / 2, 0.0, width / 2, height
+        else:
+            x0, y0, w, h = 0.0, half * height / 2, width, height / 2
+        margin = 24
+        ops.append(f"2 w {x0 + margin:.2f} {y0 + margin:.2f} {w - 2 * margin:.2f} {h - 2 * margin:.2f} re S")
+        ops.extend(_barcode_ops(x0 + 2 * margin, y0 + 2 * margin, w * 0.6, h * 0.18, rng))
+        for line in range(6):
+            text_y = y0 + h - 3 * margin - line * 18
+            ops.append(f"BT /F1 12 Tf {x0 + 2 * margin:.2f} {text_y:.2f} Td (COLIS {seed:04d}-{half}-{line}) Tj ET")
+    return "\n".join(ops)
+
+
+def _write_pdf(path: str, objects: List[bytes]) -> None:
+    """Write numbered PDF objects with their cross-reference table"""
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    
+    xref_offset = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        data += b"%010d 00000 n \n" % offset
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _single_page_objects(size: Tuple[float, float], content: bytes) -> List[bytes]:
+    """Catalog, page tree, page, content stream and Helvetica font objects"""
+    width, height = size
+    return [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] "
+         f"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>").encode('ascii'),
+        b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+
+def write_vector_label(path: str, size: Tuple[float, float], seed: int = 0) -> None:
+    """Write a single page vector PDF (text, frames and barcodes)"""
+    content = _label_ops(*size, seed).encode('ascii')
+    _write_pdf(path, _single_page_objects(size, content))
+
+
+def write_image_label(path: str, size: Tuple[float, float], seed: int = 0, dpi: int = 300) -> None:
+    """Write a single page PDF holding one full page photo-like scan"""
+    width, height = (round(value * dpi / 72) for value in size)
+    rng = random.Random(seed)
+    
+    # Noise defeats compression, like a scanned label
+    image = Image.effect_noise((width, height), 48).convert('RGB')
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x, y = rng.randrange(width), rng.randrange(height)
+        draw.rectangle((x, y, x + rng.randrange(20, 400), y + rng.randrange(20, 200)), fill=(0, 0, 0))
+    image.save(path, 'PDF', resolution=float(dpi), quality=90)
+
+
+def write_blank_label(path: str, size: Tuple[float, float]) -> None:
+    """Write a single empty page"""
+    _write_pdf(path, _single_page_objects(size, b""))
+
+
+def generate_fixtures(output_dir: str) -> Dict[str, str]:
+    """Generate every fixture in output_dir and return name -> path"""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for seed, (name, (size, kind)) in enumerate(FIXTURES.items()):
+        path = os.path.join(output_dir, f"{name}.pdf")
+        if kind == "vector":
+            write_vector_label(path, size, seed)
+        elif kind == "image":
+            write_image_label(path, size, seed)
+        else:
+            write_blank_label(path, size)
+        paths[name] = path
+    return paths
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+    for name, path in generate_fixtures(sys.argv[1]).items():
+        print(f"✅ {name}: {path}")
\ No newline at end of file
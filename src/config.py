@@ -3,7 +3,7 @@ Configuration settings for PDF Combiner application
 """
 
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Optional, Tuple
 
 
 @dataclass
@@ -23,6 +23,44 @@ class AppConfig:
     PREVIEW_DPI: int = 100
     EXPORT_DPI: int = 300
     PREVIEW_MAX_SIZE: Tuple[int, int] = (120, 140)
+    PREVIEW_REDUCING_GAP: float = 2.0  # Box-reduce first, then LANCZOS over the last 2x
+    
+    # Render policy: "single" rasterizes once at EXPORT_DPI and derives the
+    # preview by downscaling, "separate" renders the preview at PREVIEW_DPI
+    # and the export image on demand
+    RENDER_POLICY: str = "single"
+    
+    # In the interface, render only the preview on selection and the export
+    # resolution page in the background, joined when "Combiner" is clicked.
+    # Off by default: it costs two renders per label instead of the single
+    # render of RENDER_POLICY "single", in exchange for a faster preview
+    HIRES_PREFETCH: bool = False
+    
+    # Find each label's bounding box on the low resolution page instead of
+    # splitting it at the middle; only the labels are then rendered and
+    # composed. Pages without a blank gap between two labels keep the halves.
+    LABEL_DETECTION: bool = True
+    LABEL_THRESHOLD: int = 200  # Gray levels below count as content
+    LABEL_MARGIN_POINTS: float = 6.0  # White border kept around each label
+    LABEL_SPLIT_RANGE: float = 0.25  # Gap searched up to this page fraction from the middle
+    
+    # Rasterizer backend: "poppler" (pdftocairo subprocess) or "pdfium"
+    # (in-process, requires pypdfium2)
+    RENDERER_BACKEND: str = "poppler"
+    
+    # Pixel mode requested from the renderer and kept through crop, combine
+    # and export: "RGB", "L" (grayscale) or "1" (black and white)
+    PIPELINE_COLOR_MODE: str = "RGB"
+    
+    # Render cache settings (raw pixel buffers under the user cache dir)
+    CACHE_APP_NAME: str = "PDFCombiner"
+    RENDER_CACHE_ENABLED: bool = True
+    RENDER_CACHE_DIR: Optional[str] = None  # None = <user cache dir>/renders
+    RENDER_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    
+    # Output cache: manifest of exported pairs, linked again instead of re-rendered
+    OUTPUT_CACHE_ENABLED: bool = True
+    OUTPUT_CACHE_DIR: Optional[str] = None  # None = <user cache dir>/outputs
     
     # A4 dimensions at 300 DPI
     A4_WIDTH_300DPI: int = 2480
@@ -30,8 +68,14 @@ class AppConfig:
     
     # Export settings
     DEFAULT_EXPORT_FORMAT: str = "PDF"
-    SUPPORTED_FORMATS: Tuple[str, ...] = ("PDF", "PNG")
+    SUPPORTED_FORMATS: Tuple[str, ...] = ("PDF", "PNG", "PDF-G4", "TIFF-G4")
+    MULTIPAGE_FORMATS: Tuple[str, ...] = ("PDF", "PDF-G4", "TIFF-G4")  # Formats holding several sheets per file
     EXPORT_QUALITY: int = 100
+    VECTOR_PDF_EXPORT: bool = True  # Compose PDF exports from source pages (requires pikepdf)
+    
+    # Bilevel (black and white) export for the -G4 formats, CCITT Group 4 compressed
+    BILEVEL_THRESHOLD: int = 160  # Gray levels below become black
+    BILEVEL_DITHER: bool = False  # Floyd-Steinberg dithering instead of a hard threshold
     
     # File dialog settings
     PDF_FILE_TYPES: Tuple[Tuple[str, str], ...] = (
@@ -47,6 +91,25 @@ class AppConfig:
     
     # Processing settings
     THREAD_DAEMON: bool = True
+    TRACE_LOG_PATH: Optional[str] = None  # JSON lines log of stage timings, None = disabled
+    IMAGE_BLOCKS_MAX: int = 8  # Freed 16 MB Pillow memory blocks kept for reuse between canvases
+    
+    # Multi-page streaming: pages rendered per chunk and pdftocairo
+    # processes used for each chunk
+    STREAM_CHUNK_PAGES: int = 4
+    STREAM_THREAD_COUNT: int = 2
+    
+    # Batch settings
+    BATCH_WORKERS: int = 0  # 0 = one worker process per CPU
+    BATCH_BLANK_NAME: str = "blank"
+    
+    # Watch mode (batch.py --watch)
+    WATCH_POLL_INTERVAL: float = 1.0  # Seconds between inbox scans
+    WATCH_STABLE_CHECKS: int = 2  # Scans with an unchanged size before a file counts as fully written
+    WATCH_PAIR_TIMEOUT: float = 60.0  # Seconds before a lone file is combined with a blank page (0 = wait)
+    WATCH_QUEUE_SIZE: int = 8  # Pairs waiting for a worker; scanning pauses when the queue is full
+    WATCH_DONE_DIR: str = "traites"  # Inbox subfolders receiving processed inputs
+    WATCH_FAILED_DIR: str = "erreurs"
     
     # Default filenames
     DEFAULT_TOP_FILENAME: str = "tops_combined"
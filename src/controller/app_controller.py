@@ -6,11 +6,11 @@ import threading
 from typing import Optional
 import os
 
-from ..core import PDFProcessor
+from ..core import PDFProcessor, CancellationToken
 from ..ui import MainWindow
-from ..models import Orientation, ExportConfig
+from ..models import Orientation, ExportConfig, ExportSnapshot
 from ..config import config
-from ..exceptions import PDFCombinerError, PDFLoadError, ValidationError
+from ..exceptions import PDFCombinerError, PDFLoadError, ValidationError, OperationCancelledError
 from ..utils import (
     get_filename_without_extension,
     resize_image_for_preview,
@@ -18,6 +18,16 @@ from ..utils import (
 )
 
 
+# Processing stage -> status message
+PROGRESS_MESSAGES = {
+    "render": "Rendu des pages en haute résolution...",
+    "compose_top": "Combinaison des moitiés hautes...",
+    "compose_bottom": "Combinaison des moitiés basses...",
+    "preview": "Création des aperçus...",
+    "done": "Images combinées prêtes !",
+}
+
+
 class AppController:
     """Main application controller - orchestrates the application"""
     
@@ -25,6 +35,13 @@ class AppController:
         self.processor = PDFProcessor()
         self.window = MainWindow()
         self.processing = False
+        self.exporting = False
+        self.result_stale = False  # Inputs changed since the last combination
+        self.current_job: Optional[CancellationToken] = None
+        
+        # Orientation is detected from the pages until the user picks one
+        for pdf_number in (1, 2):
+            self.processor.set_orientation(pdf_number, Orientation.AUTO)
         
         # Connect UI callbacks
         self.setup_callbacks()
@@ -40,13 +57,19 @@ class AppController:
         
     def handle_pdf_selected(self, pdf_number: int, file_path: str) -> None:
         """Handle PDF file selection"""
+        self.cancel_current_job()
         try:
             # Load PDF
-            self.processor.load_pdf_from_file(file_path, pdf_number)
+            self.processor.tracer.reset()
+            self.processor.load_pdf_from_file(file_path, pdf_number, prefetch=config.HIRES_PREFETCH)
             
             # Update UI
             filename = os.path.basename(file_path)
             self.window.update_pdf_info(pdf_number, filename, is_blank=False)
+            self.window.update_status(
+                self.with_stage_breakdown(f"PDF {pdf_number} chargé{self.describe_orientation(pdf_number)}"),
+                config.INFO_COLOR
+            )
             
             # Update preview
             preview_image = self.processor.get_preview_image(pdf_number)
@@ -60,6 +83,7 @@ class AppController:
             
             # Update filename suggestions
             self.update_filename_suggestions()
+            self.update_live_preview()
             
         except PDFLoadError as e:
             self.window.show_error("Erreur de chargement", str(e))
@@ -68,6 +92,7 @@ class AppController:
     
     def handle_blank_selected(self, pdf_number: int) -> None:
         """Handle blank page selection"""
+        self.cancel_current_job()
         try:
             # Load blank page
             self.processor.load_blank_page(pdf_number)
@@ -82,6 +107,7 @@ class AppController:
             
             # Update filename suggestions
             self.update_filename_suggestions()
+            self.update_live_preview()
             
         except PDFLoadError as e:
             self.window.show_error("Erreur de création", str(e))
@@ -90,24 +116,55 @@ class AppController:
     
     def handle_orientation_changed(self, pdf_number: int, orientation: str) -> None:
         """Handle orientation change"""
+        self.cancel_current_job()
         try:
             # Convert string to Orientation enum
-            orientation_enum = Orientation.PORTRAIT if orientation == "Portrait" else Orientation.LANDSCAPE
+            orientation_enum = Orientation(orientation)
             
             # Update processor
             self.processor.set_orientation(pdf_number, orientation_enum)
-            
-            # Note: We don't update the preview here as it would require 
-            # reloading the high-res image, which is expensive
+            self.update_live_preview()
             
         except Exception as e:
             self.window.show_error("Erreur", f"Erreur lors du changement d'orientation: {str(e)}")
     
+    def describe_orientation(self, pdf_number: int) -> str:
+        """Describe the detected orientation of a PDF for status messages"""
+        document = self.processor.pdf1 if pdf_number == 1 else self.processor.pdf2
+        if document.orientation != Orientation.AUTO:
+            return ""
+        return f" (orientation détectée: {self.processor.get_orientation(pdf_number).value})"
+    
+    def update_live_preview(self) -> None:
+        """Combine the preview pages live, the high resolution pass waits for the process button"""
+        try:
+            previews = self.processor.preview_combination()
+        except PDFCombinerError:
+            previews = None
+        
+        if previews:
+            self.window.update_combined_previews(*previews)
+            
+            # The combined images no longer match what is shown
+            self.result_stale = True
+            if not self.exporting:
+                self.window.enable_export(False)
+    
+    def cancel_current_job(self) -> None:
+        """Supersede the running job: its renders are killed and its results dropped"""
+        if self.current_job:
+            self.current_job.cancel()
+            self.current_job = None
+        
+        if self.processing:
+            self.processing = False
+            self.window.set_processing_state(False)
+            self.window.update_progress(0)
+            self.window.enable_export(False)
+            self.window.update_status("Traitement annulé", config.WARNING_COLOR)
+    
     def handle_process_clicked(self) -> None:
         """Handle process button click"""
-        if self.processing:
-            return
-        
         # Validate inputs
         if not self.processor.is_ready_to_process():
             self.window.show_warning(
@@ -116,65 +173,68 @@ class AppController:
             )
             return
         
+        # Latest request wins: a new click replaces the running job
+        self.cancel_current_job()
+        
         # Start processing in thread
+        self.processor.tracer.reset()
+        self.current_job = CancellationToken()
         self.processing = True
         self.window.set_processing_state(True)
         self.window.update_progress(0)
         self.window.update_status("Démarrage du traitement...", config.INFO_COLOR)
         
-        thread = threading.Thread(target=self.process_pdfs, daemon=config.THREAD_DAEMON)
+        thread = threading.Thread(target=self.process_pdfs, args=(self.current_job,), daemon=config.THREAD_DAEMON)
         thread.start()
     
-    def process_pdfs(self) -> None:
+    def process_pdfs(self, job: CancellationToken) -> None:
         """Process PDFs in background thread"""
+        def on_progress(fraction: float, stage: str) -> None:
+            self.window.root.after(0, lambda: self.update_job_progress(job, fraction, stage))
+        
+        def on_preview(top_preview, bottom_preview) -> None:
+            self.window.root.after(0, lambda: self.update_job_previews(job, top_preview, bottom_preview))
+        
         try:
-            # Update progress
-            self.window.root.after(0, lambda: self.window.update_progress(0.1))
-            self.window.root.after(0, lambda: self.window.update_status(
-                "Traitement des éléments...", config.INFO_COLOR
-            ))
-            
-            # Process combination
-            self.window.root.after(0, lambda: self.window.update_progress(0.5))
-            self.window.root.after(0, lambda: self.window.update_status(
-                "Découpage et combinaison des images...", config.INFO_COLOR
-            ))
-            
-            combined_document = self.processor.process_combination()
-            
-            # Update progress
-            self.window.root.after(0, lambda: self.window.update_progress(0.8))
-            self.window.root.after(0, lambda: self.window.update_status(
-                "Images combinées prêtes !", config.SUCCESS_COLOR
-            ))
-            
-            # Update UI with results
-            self.window.root.after(0, lambda: self.window.update_combined_previews(
-                combined_document.top_combined,
-                combined_document.bottom_combined
-            ))
-            
-            # Enable export
-            self.window.root.after(0, lambda: self.window.enable_export(True))
-            
-            # Finish processing
-            self.window.root.after(0, lambda: self.finish_processing())
+            combined_document = self.processor.process_combination(on_progress, job, on_preview)
+            self.window.root.after(0, lambda: self.finish_processing(job, combined_document))
             
+        except OperationCancelledError:
+            pass  # Superseded, the newer job owns the UI
         except ValidationError as e:
+            message = str(e)
             self.window.root.after(0, lambda: self.handle_processing_error(
-                "Erreur de validation", str(e)
+                job, "Erreur de validation", message
             ))
         except PDFCombinerError as e:
+            message = str(e)
             self.window.root.after(0, lambda: self.handle_processing_error(
-                "Erreur de traitement", str(e)
+                job, "Erreur de traitement", message
             ))
         except Exception as e:
+            message = f"Erreur inattendue: {str(e)}"
             self.window.root.after(0, lambda: self.handle_processing_error(
-                "Erreur", f"Erreur inattendue: {str(e)}"
+                job, "Erreur", message
             ))
     
-    def handle_processing_error(self, title: str, message: str) -> None:
+    def update_job_progress(self, job: CancellationToken, fraction: float, stage: str) -> None:
+        """Show progress of the current job (ignores superseded jobs)"""
+        if job is not self.current_job:
+            return
+        self.window.update_progress(fraction)
+        self.window.update_status(PROGRESS_MESSAGES.get(stage, stage), config.INFO_COLOR)
+    
+    def update_job_previews(self, job: CancellationToken, top_preview, bottom_preview) -> None:
+        """Show early previews of the current job (ignores superseded jobs)"""
+        if job is not self.current_job:
+            return
+        self.window.update_combined_previews(top_preview, bottom_preview)
+    
+    def handle_processing_error(self, job: CancellationToken, title: str, message: str) -> None:
         """Handle processing error"""
+        if job is not self.current_job:
+            return
+        self.current_job = None
         self.window.show_error(title, message)
         self.window.set_processing_state(False)
         self.window.update_progress(0)
@@ -185,67 +245,134 @@ class AppController:
         self.window.enable_export(False)
         self.processing = False
     
-    def finish_processing(self) -> None:
+    def finish_processing(self, job: CancellationToken, combined_document) -> None:
         """Finish processing and update UI"""
+        if job is not self.current_job:
+            return
+        self.current_job = None
         self.processing = False
+        self.result_stale = False
+        
+        # Update UI with results, previews were already made by the worker
+        self.window.update_combined_previews(
+            combined_document.top_preview,
+            combined_document.bottom_preview
+        )
+        self.window.enable_export(True)
+        
         self.window.set_processing_state(False)
         self.window.update_progress(1.0)
         self.window.update_status(
-            "Combinaison terminée ! Vous pouvez maintenant exporter les fichiers.",
+            self.with_stage_breakdown("Combinaison terminée ! Vous pouvez maintenant exporter les fichiers."),
             config.SUCCESS_COLOR
         )
     
     def handle_export_clicked(self, export_config: ExportConfig, save_directory: str) -> None:
         """Handle export button click"""
+        if self.exporting:
+            return
+        
         if not self.processor.combined.is_ready:
             self.window.show_warning("Attention", "Veuillez d'abord combiner les PDF")
             return
         
+        # The pair can change while the files are written, export a copy of it
         try:
-            # Update UI
-            self.window.update_status(
-                f"Création des {export_config.format_type} {export_config.dpi} DPI...",
-                config.INFO_COLOR
-            )
-            
-            # Export documents
-            top_path, bottom_path = self.processor.export_combined_documents(
-                save_directory, 
-                export_config
-            )
-            
-            # Update UI
-            self.window.update_status(
-                f"{export_config.format_type} {export_config.dpi} DPI exportés avec succès !",
-                config.SUCCESS_COLOR
-            )
-            
-            # Show success dialog
-            self.window.show_success_dialog(
-                format_type=export_config.format_type,
-                top_filename=os.path.basename(top_path),
-                bottom_filename=os.path.basename(bottom_path),
-                save_directory=save_directory
-            )
-            
+            snapshot = self.processor.snapshot_export(export_config)
         except PDFCombinerError as e:
             self.window.show_error("Erreur d'export", str(e))
-            self.window.update_status(
-                f"✗ Erreur lors de l'export: {str(e)}",
-                config.ERROR_COLOR
-            )
+            return
         except Exception as e:
             self.window.show_error("Erreur", f"Erreur inattendue: {str(e)}")
-            self.window.update_status(
-                f"✗ Erreur lors de l'export: {str(e)}",
-                config.ERROR_COLOR
+            return
+        
+        # Update UI
+        self.exporting = True
+        self.window.set_exporting_state(True)
+        self.window.update_progress(0)
+        self.window.update_status(
+            f"Création des {export_config.format_type} {export_config.dpi} DPI...",
+            config.INFO_COLOR
+        )
+        
+        # Encoding takes seconds, keep the window responsive
+        self.processor.tracer.reset()
+        thread = threading.Thread(
+            target=self.export_documents,
+            args=(snapshot, export_config, save_directory),
+            daemon=config.THREAD_DAEMON
+        )
+        thread.start()
+    
+    def export_documents(self, snapshot: ExportSnapshot, export_config: ExportConfig, save_directory: str) -> None:
+        """Export documents in background thread"""
+        def on_progress(fraction: float, stage: str) -> None:
+            self.window.root.after(0, lambda: self.window.update_progress(fraction))
+        
+        try:
+            top_path, bottom_path = self.processor.export_snapshot(
+                snapshot,
+                save_directory,
+                export_config,
+                on_progress
             )
+            self.window.root.after(0, lambda: self.finish_export(
+                export_config, save_directory, top_path, bottom_path
+            ))
+            
+        except PDFCombinerError as e:
+            message = str(e)
+            self.window.root.after(0, lambda: self.handle_export_error("Erreur d'export", message, message))
+        except Exception as e:
+            message = str(e)
+            self.window.root.after(0, lambda: self.handle_export_error(
+                "Erreur", f"Erreur inattendue: {message}", message
+            ))
+    
+    def finish_export(self, export_config: ExportConfig, save_directory: str,
+                      top_path: str, bottom_path: str) -> None:
+        """Finish export once both files are written and update UI"""
+        self.exporting = False
+        self.window.set_exporting_state(False)
+        self.window.enable_export(not self.result_stale)
+        self.window.update_progress(1.0)
+        self.window.update_status(
+            self.with_stage_breakdown(
+                f"{export_config.format_type} {export_config.dpi} DPI exportés avec succès !"
+            ),
+            config.SUCCESS_COLOR
+        )
+        
+        # Show success dialog
+        self.window.show_success_dialog(
+            format_type=export_config.format_type,
+            top_filename=os.path.basename(top_path),
+            bottom_filename=os.path.basename(bottom_path),
+            save_directory=save_directory
+        )
+    
+    def handle_export_error(self, title: str, message: str, status: str) -> None:
+        """Handle export error"""
+        self.exporting = False
+        self.window.set_exporting_state(False)
+        self.window.enable_export(not self.result_stale)
+        self.window.update_progress(0)
+        self.window.show_error(title, message)
+        self.window.update_status(
+            f"✗ Erreur lors de l'export: {status}",
+            config.ERROR_COLOR
+        )
     
     def handle_export_format_changed(self, format_type: str) -> None:
         """Handle export format change"""
         # Update the combined document export format
         self.processor.combined.export_format = format_type
     
+    def with_stage_breakdown(self, message: str) -> str:
+        """Append the per-stage timings of the last action to a status message"""
+        breakdown = self.processor.tracer.format_breakdown()
+        return f"{message}\n{breakdown}" if breakdown else message
+    
     def update_filename_suggestions(self) -> None:
         """Update filename suggestions based on loaded PDFs"""
         # Get PDF names
@@ -3,5 +3,48 @@ Core business logic module for PDF Combiner application
 """
 
 from .pdf_processor import PDFProcessor
+from .batch_processor import (
+    BatchProcessor,
+    make_batch_job,
+    pair_pdf_files,
+    make_document_jobs,
+    make_sheet_jobs,
+    run_batch_job,
+    run_document_job,
+    run_sheet_job,
+    compose_job_sheets
+)
+from .layout import SheetLayout, Cell, LAYOUT_PRESETS, get_layout, grid_cells, impose
+from .label_detection import find_label_boxes
+from .output_cache import OutputCache
+from .watch_processor import FolderWatcher, FilePairer, StableFileDetector, is_inotify_available
+from .cancellation import CancellationToken
+from .tracing import Tracer, format_stage_breakdown
 
-__all__ = ['PDFProcessor'] 
\ No newline at end of file
+__all__ = [
+    'PDFProcessor',
+    'BatchProcessor',
+    'make_batch_job',
+    'pair_pdf_files',
+    'make_document_jobs',
+    'make_sheet_jobs',
+    'run_batch_job',
+    'run_document_job',
+    'run_sheet_job',
+    'compose_job_sheets',
+    'SheetLayout',
+    'Cell',
+    'LAYOUT_PRESETS',
+    'get_layout',
+    'grid_cells',
+    'impose',
+    'find_label_boxes',
+    'OutputCache',
+    'FolderWatcher',
+    'FilePairer',
+    'StableFileDetector',
+    'is_inotify_available',
+    'CancellationToken',
+    'Tracer',
+    'format_stage_breakdown'
+] 
\ No newline at end of file
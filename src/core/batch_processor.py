@@ -0,0 +1,392 @@
+"""
+Headless batch processing across a process pool
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+from PIL import Image
+
+from ..models import BatchJob, DocumentJob, SheetJob, JobResult, BatchReport, ExportConfig, Orientation, PDFDocument
+from ..config import config
+from ..exceptions import ImageProcessingError, ValidationError
+from ..utils import get_filename_without_extension, save_image_with_format
+from .layout import get_layout
+from .pdf_processor import PDFProcessor
+
+
+def make_batch_job(job_id: int, pdf1_path: str, pdf2_path: Optional[str],
+                   orientation1: Orientation = Orientation.PORTRAIT,
+                   orientation2: Orientation = Orientation.PORTRAIT) -> BatchJob:
+    """Create a pair job (pdf2_path None is a blank page)"""
+    # Use the same naming scheme as the export panel suggestions
+    pdf1_name = get_filename_without_extension(pdf1_path)
+    pdf2_name = get_filename_without_extension(pdf2_path) if pdf2_path else config.BATCH_BLANK_NAME
+    base_name = f"{pdf1_name}_{pdf2_name}"
+    
+    return BatchJob(
+        job_id=job_id,
+        pdf1_path=pdf1_path,
+        pdf2_path=pdf2_path,
+        orientation1=orientation1,
+        orientation2=orientation2,
+        top_filename=f"{base_name}_hauts",
+        bottom_filename=f"{base_name}_bas"
+    )
+
+
+def pair_pdf_files(pdf_files: Sequence[str],
+                   orientation1: Orientation = Orientation.PORTRAIT,
+                   orientation2: Orientation = Orientation.PORTRAIT) -> List[BatchJob]:
+    """Pair consecutive PDF files into batch jobs (odd count ends with a blank page)"""
+    jobs = []
+    for index in range(0, len(pdf_files), 2):
+        pdf2_path = pdf_files[index + 1] if index + 1 < len(pdf_files) else None
+        jobs.append(make_batch_job(len(jobs) + 1, pdf_files[index], pdf2_path, orientation1, orientation2))
+    return jobs
+
+
+def make_document_jobs(pdf_files: Sequence[str],
+                       orientation1: Orientation = Orientation.PORTRAIT,
+                       orientation2: Orientation = Orientation.PORTRAIT) -> List[DocumentJob]:
+    """Create one streaming job per multi-page document"""
+    return [
+        DocumentJob(
+            job_id=index,
+            file_path=file_path,
+            orientation1=orientation1,
+            orientation2=orientation2,
+            base_filename=get_filename_without_extension(file_path)
+        )
+        for index, file_path in enumerate(pdf_files, start=1)
+    ]
+
+
+def make_sheet_jobs(pdf_files: Sequence[str], layout_name: str,
+                    orientation: Orientation = Orientation.PORTRAIT) -> List[SheetJob]:
+    """Group consecutive PDF files into one job per sheet of the layout"""
+    capacity = get_layout(layout_name).capacity
+    jobs = []
+    for start in range(0, len(pdf_files), capacity):
+        pdf_paths = tuple(pdf_files[start:start + capacity])
+        first_name = get_filename_without_extension(pdf_paths[0])
+        last_name = get_filename_without_extension(pdf_paths[-1])
+        jobs.append(SheetJob(
+            job_id=len(jobs) + 1,
+            pdf_paths=pdf_paths,
+            layout=layout_name,
+            orientation=orientation,
+            filename=f"{first_name}_{last_name}_planche" if len(pdf_paths) > 1 else f"{first_name}_planche"
+        ))
+    return jobs
+
+
+def _make_job_export_config(export_config: ExportConfig, top_filename: str,
+                            bottom_filename: str) -> ExportConfig:
+    """Copy export settings with job-specific filenames"""
+    return ExportConfig(
+        format_type=export_config.format_type,
+        quality=export_config.quality,
+        dpi=export_config.dpi,
+        top_filename=top_filename,
+        bottom_filename=bottom_filename
+    )
+
+
+def _make_processor(trace_log: Optional[str]) -> PDFProcessor:
+    """Create a worker processor, logging its stage spans when requested"""
+    processor = PDFProcessor()
+    if trace_log:
+        # Passed explicitly: spawned workers do not inherit runtime config changes
+        processor.tracer.log_path = trace_log
+    return processor
+
+
+def _load_job_pair(processor: PDFProcessor, job: BatchJob, render: bool) -> None:
+    """Load both inputs of a pair job with their orientations"""
+    for pdf_number, file_path, orientation in (
+        (1, job.pdf1_path, job.orientation1),
+        (2, job.pdf2_path, job.orientation2)
+    ):
+        if file_path:
+            processor.load_pdf_from_file(file_path, pdf_number, render=render)
+        else:
+            processor.load_blank_page(pdf_number)
+        processor.set_orientation(pdf_number, orientation)
+
+
+def run_batch_job(job: BatchJob, save_directory: str, export_config: ExportConfig,
+                  trace_log: Optional[str] = None) -> JobResult:
+    """Process and export a single job (runs inside a worker process)"""
+    start = time.perf_counter()
+    processor = _make_processor(trace_log)
+    try:
+        job_config = _make_job_export_config(export_config, job.top_filename, job.bottom_filename)
+        
+        # Vector export needs no raster images, there is no preview to show
+        rasterize = not processor.can_export_vector(job_config)
+        _load_job_pair(processor, job, render=False)
+        
+        # A pair already exported with the same settings is linked, not rendered again
+        if rasterize and not processor.has_cached_outputs(job_config):
+            _load_job_pair(processor, job, render=True)
+            processor.process_combination()
+        
+        top_path, bottom_path = processor.export_combined_documents(save_directory, job_config)
+        
+        return JobResult(
+            job_id=job.job_id,
+            success=True,
+            latency=time.perf_counter() - start,
+            top_path=top_path,
+            bottom_path=bottom_path,
+            stages=processor.tracer.stage_times()
+        )
+    except Exception as e:
+        return JobResult(
+            job_id=job.job_id,
+            success=False,
+            latency=time.perf_counter() - start,
+            error=str(e),
+            stages=processor.tracer.stage_times()
+        )
+
+
+def run_sheet_job(job: SheetJob, save_directory: str, export_config: ExportConfig,
+                  trace_log: Optional[str] = None) -> JobResult:
+    """Impose and export one sheet (runs inside a worker process)"""
+    start = time.perf_counter()
+    processor = _make_processor(trace_log)
+    try:
+        documents = [PDFDocument(file_path=file_path, orientation=job.orientation) for file_path in job.pdf_paths]
+        job_config = _make_job_export_config(export_config, job.filename, job.filename)
+        paths = processor.export_sheets(documents, get_layout(job.layout), save_directory, job_config)
+        
+        return JobResult(
+            job_id=job.job_id,
+            success=True,
+            latency=time.perf_counter() - start,
+            top_path=paths[0],
+            stages=processor.tracer.stage_times()
+        )
+    except Exception as e:
+        return JobResult(
+            job_id=job.job_id,
+            success=False,
+            latency=time.perf_counter() - start,
+            error=str(e),
+            stages=processor.tracer.stage_times()
+        )
+
+
+def run_document_job(job: DocumentJob, save_directory: str, export_config: ExportConfig,
+                     trace_log: Optional[str] = None) -> List[JobResult]:
+    """Stream a multi-page document and export each page pair as it is rendered"""
+    results = []
+    processor = _make_processor(trace_log)
+    rasterize = not processor.can_export_vector(export_config)
+    pairs = processor.iter_document_pairs(job.file_path, job.orientation1, job.orientation2, render=rasterize)
+    
+    start = time.perf_counter()
+    try:
+        for page1, page2 in pairs:
+            page_suffix = f"p{page1}_p{page2}" if page2 else f"p{page1}_{config.BATCH_BLANK_NAME}"
+            base_name = f"{job.base_filename}_{page_suffix}"
+            job_config = _make_job_export_config(export_config, f"{base_name}_hauts", f"{base_name}_bas")
+            
+            try:
+                if rasterize:
+                    processor.process_combination()
+                top_path, bottom_path = processor.export_combined_documents(save_directory, job_config)
+                results.append(JobResult(
+                    job_id=job.job_id,
+                    success=True,
+                    pages=(page1, page2),
+                    latency=time.perf_counter() - start,
+                    top_path=top_path,
+                    bottom_path=bottom_path,
+                    stages=processor.tracer.stage_times()
+                ))
+            except Exception as e:
+                results.append(JobResult(
+                    job_id=job.job_id,
+                    success=False,
+                    pages=(page1, page2),
+                    latency=time.perf_counter() - start,
+                    error=str(e),
+                    stages=processor.tracer.stage_times()
+                ))
+            
+            # Latency and stages of the next pair include rendering its pages
+            start = time.perf_counter()
+            processor.tracer.reset()
+    except Exception as e:
+        # Rendering the document itself failed, report what is left as one failure
+        results.append(JobResult(
+            job_id=job.job_id,
+            success=False,
+            latency=time.perf_counter() - start,
+            error=str(e)
+        ))
+    
+    return results
+
+
+def compose_job_sheets(job: Union[BatchJob, SheetJob],
+                       trace_log: Optional[str] = None) -> Tuple[JobResult, List[Image.Image]]:
+    """Compose the sheets of a pair or sheet job without writing them (runs inside a worker process)"""
+    start = time.perf_counter()
+    processor = _make_processor(trace_log)
+    try:
+        if isinstance(job, SheetJob):
+            documents = [PDFDocument(file_path=file_path, orientation=job.orientation) for file_path in job.pdf_paths]
+            sheets = list(processor.iter_sheet_images(documents, get_layout(job.layout)))
+        else:
+            _load_job_pair(processor, job, render=True)
+            combined = processor.process_combination()
+            sheets = [combined.top_combined, combined.bottom_combined]
+        
+        result = JobResult(
+            job_id=job.job_id,
+            success=True,
+            latency=time.perf_counter() - start,
+            stages=processor.tracer.stage_times()
+        )
+        return result, sheets
+    except Exception as e:
+        result = JobResult(
+            job_id=job.job_id,
+            success=False,
+            latency=time.perf_counter() - start,
+            error=str(e),
+            stages=processor.tracer.stage_times()
+        )
+        return result, []
+
+
+# Worker function of each job type
+JOB_RUNNERS = {
+    BatchJob: run_batch_job,
+    DocumentJob: run_document_job,
+    SheetJob: run_sheet_job,
+}
+
+
+class BatchProcessor:
+    """Run batch jobs across a pool of worker processes"""
+    
+    def __init__(self, save_directory: str, export_config: Optional[ExportConfig] = None,
+                 workers: Optional[int] = None, trace_log: Optional[str] = None):
+        self.save_directory = save_directory
+        self.export_config = export_config or ExportConfig()
+        self.workers = workers or config.BATCH_WORKERS or os.cpu_count() or 1
+        self.trace_log = trace_log or config.TRACE_LOG_PATH
+    
+    def run(self, jobs: Sequence[Union[BatchJob, DocumentJob, SheetJob]],
+            on_job_done: Optional[Callable[[JobResult], None]] = None) -> BatchReport:
+        """Run all jobs and return the aggregated report"""
+        if not jobs:
+            raise ValidationError("No jobs to process")
+        
+        os.makedirs(self.save_directory, exist_ok=True)
+        
+        report = BatchReport(workers=self.workers)
+        start = time.perf_counter()
+        
+        # Rendering and pixel work are CPU-bound, so use processes rather than threads
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(
+                    JOB_RUNNERS[type(job)],
+                    job, self.save_directory, self.export_config, self.trace_log
+                )
+                for job in jobs
+            ]
+            for future in as_completed(futures):
+                results = future.result()
+                if isinstance(results, JobResult):
+                    results = [results]
+                for result in results:
+                    report.results.append(result)
+                    if on_job_done:
+                        on_job_done(result)
+        
+        report.wall_time = time.perf_counter() - start
+        report.results.sort(key=lambda result: (result.job_id, result.pages or (0, 0)))
+        return report
+    
+    def run_single_file(self, jobs: Sequence[Union[BatchJob, SheetJob]], filename: str,
+                        on_job_done: Optional[Callable[[JobResult], None]] = None) -> BatchReport:
+        """Run all jobs and append their sheets, in job order, to one multi-page file
+        
+        Workers compose the sheets and this process encodes each one at the end
+        of the file as soon as the jobs before it are written. At most two jobs
+        per worker are in flight, so memory stays flat whatever the batch size.
+        Sheets are always rasterized, vector export writes one file per job.
+        """
+        if not jobs:
+            raise ValidationError("No jobs to process")
+        if any(isinstance(job, DocumentJob) for job in jobs):
+            raise ValidationError("Multi-page document jobs cannot be written to a single file")
+        
+        format_type = self.export_config.format_type.upper()
+        if format_type not in config.MULTIPAGE_FORMATS:
+            raise ValidationError(f"Format {format_type} does not support multi-page documents")
+        
+        os.makedirs(self.save_directory, exist_ok=True)
+        file_config = ExportConfig(format_type=format_type, top_filename=filename)
+        file_path = os.path.join(self.save_directory, file_config.get_full_filename(is_top=True))
+        
+        report = BatchReport(workers=self.workers)
+        start = time.perf_counter()
+        page_count = 0
+        
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            remaining = iter(jobs)
+            in_flight = deque()
+            
+            def submit_next() -> None:
+                job = next(remaining, None)
+                if job is not None:
+                    in_flight.append(executor.submit(compose_job_sheets, job, self.trace_log))
+            
+            for _ in range(self.workers * 2):
+                submit_next()
+            
+            while in_flight:
+                result, sheets = in_flight.popleft().result()
+                submit_next()  # Keep workers busy while this job is encoded
+                
+                if result.success:
+                    encode_start = time.perf_counter()
+                    try:
+                        while sheets:
+                            save_image_with_format(
+                                sheets.pop(0),
+                                file_path,
+                                format_type,
+                                self.export_config.quality,
+                                self.export_config.dpi,
+                                append=page_count > 0
+                            )
+                            page_count += 1
+                    except ImageProcessingError as e:
+                        # The file itself is broken, later sheets cannot be appended either
+                        for future in in_flight:
+                            future.cancel()
+                        raise ImageProcessingError(f"Failed to write {file_path}: {str(e)}")
+                    
+                    encode_time = time.perf_counter() - encode_start
+                    result.stages["encode"] = result.stages.get("encode", 0.0) + encode_time
+                    result.latency += encode_time
+                    result.top_path = file_path
+                
+                report.results.append(result)
+                if on_job_done:
+                    on_job_done(result)
+        
+        report.wall_time = time.perf_counter() - start
+        return report
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Cooperative cancellation for long-running processing
+"""
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, List, Optional
+
+from PIL import Image
+
+from ..exceptions import OperationCancelledError
+
+# Called with (fraction done in [0, 1], stage name) at stage boundaries
+ProgressCallback = Callable[[float, str], None]
+
+# Called with (top, bottom) preview thumbnails
+PreviewCallback = Callable[[Image.Image, Image.Image], None]
+
+
+class CancellationToken:
+    """Flag shared between the caller and a running job
+    
+    Work checks the flag at stage boundaries; blocking resources (such as a
+    pdftocairo subprocess) register a callback to be released immediately.
+    """
+    
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+    
+    @property
+    def is_cancelled(self) -> bool:
+        """Check if cancellation was requested"""
+        return self._cancelled.is_set()
+    
+    def cancel(self) -> None:
+        """Request cancellation and release registered resources"""
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self._cancelled.set()
+            callbacks, self._callbacks = self._callbacks, []
+        
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass  # The resource may already be gone
+    
+    def raise_if_cancelled(self) -> None:
+        """Raise OperationCancelledError if cancellation was requested"""
+        if self._cancelled.is_set():
+            raise OperationCancelledError("Operation cancelled")
+    
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Call callback on cancellation (immediately if already cancelled)"""
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+    
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        """Stop tracking a released resource"""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+def wait_for_future(future: Future, cancel_token: Optional[CancellationToken] = None) -> Any:
+    """Get a future's result, raising OperationCancelledError as soon as the token is cancelled
+    
+    The future itself keeps running, it may be shared with a later job.
+    """
+    if cancel_token is None:
+        return future.result()
+    
+    cancelled = Future()
+    def on_cancel() -> None:
+        cancelled.set_result(None)
+    
+    cancel_token.add_callback(on_cancel)
+    try:
+        wait((future, cancelled), return_when=FIRST_COMPLETED)
+    finally:
+        cancel_token.remove_callback(on_cancel)
+    
+    cancel_token.raise_if_cancelled()
+    return future.result()
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+Raster compositor executing composition plans
+"""
+
+from typing import Optional, Sequence
+
+from PIL import Image
+
+from ..config import config
+from ..exceptions import ImageProcessingError
+from ..models import PageSource, SolidFill
+from ..utils import create_blank_image, transform_region
+from .layout import CompositionPlan
+
+
+def configure_image_memory(blocks_max: Optional[int] = None) -> None:
+    """Keep freed Pillow memory blocks for reuse, so successive canvases skip fresh page faults"""
+    blocks_max = config.IMAGE_BLOCKS_MAX if blocks_max is None else blocks_max
+    set_blocks_max = getattr(Image.core, 'set_blocks_max', None)
+    if set_blocks_max and blocks_max > Image.core.get_blocks_max():
+        set_blocks_max(blocks_max)
+
+
+def compose_plan(plan: CompositionPlan, sources: Sequence[PageSource],
+                 reducing_gap: Optional[float] = None) -> Image.Image:
+    """Write each planned region straight into one preallocated output canvas
+    
+    SolidFill sources are painted in place, the white canvas already holds blank ones.
+    """
+    try:
+        width, height = plan.size
+        canvas = create_blank_image(round(width), round(height), sources[0].mode)
+        
+        for placement in plan.placements:
+            source = sources[placement.source]
+            if isinstance(source, SolidFill):
+                if source.color != 'white':
+                    canvas.paste(source.color, tuple(int(value) for value in placement.box))
+                continue
+            
+            # One transient region buffer at a time, released right after pasting
+            piece = transform_region(
+                source,
+                placement.region.box,
+                placement.region.rotation,
+                placement.size,
+                reducing_gap
+            )
+            if piece.mode != canvas.mode:
+                piece = piece.convert(canvas.mode)
+            canvas.paste(piece, tuple(int(value) for value in placement.position))
+            del piece
+        
+        return canvas
+    except ImageProcessingError:
+        raise
+    except Exception as e:
+        raise ImageProcessingError(f"Failed to compose image: {str(e)}")
\ No newline at end of file
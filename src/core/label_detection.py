@@ -0,0 +1,124 @@
+"""
+Label bounding box detection on low resolution pages
+"""
+
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+from ..config import config
+from ..models import Orientation
+from .layout import Box
+
+
+def _get_content_mask(image: Image.Image) -> Image.Image:
+    """Get a mask where content, darker than LABEL_THRESHOLD, is 255 and background 0"""
+    gray = image if image.mode == 'L' else image.convert('L')
+    threshold = config.LABEL_THRESHOLD
+    return gray.point(lambda value: 255 if value < threshold else 0)
+
+
+def _get_profile(mask: Image.Image, axis: int) -> List[bool]:
+    """Tell for each column (axis 0) or row (axis 1) of a mask whether it holds content"""
+    if axis == 0:
+        mask = mask.transpose(Image.Transpose.TRANSPOSE)
+    
+    # Collapse the rows in C: a block with any content keeps a non-zero mean
+    while mask.width > 1:
+        mask = mask.reduce((min(mask.width, 16), 1)).point(lambda value: 255 if value else 0)
+    return [bool(value) for value in mask.getdata()]
+
+
+def _find_gap(profile: List[bool]) -> Optional[Tuple[int, int]]:
+    """Get the widest blank run near the centre of a profile with content on both sides"""
+    length = len(profile)
+    low = int(length * (0.5 - config.LABEL_SPLIT_RANGE))
+    high = int(length * (0.5 + config.LABEL_SPLIT_RANGE))
+    
+    best = None
+    start = None
+    for position, has_content in enumerate(profile):
+        if not has_content:
+            if start is None:
+                start = position
+            continue
+        # Runs from the page edge are margins, not a gap between labels
+        if start and start < high and position > low:
+            # Widest gap wins, the closest to the middle on a tie
+            key = (position - start, -abs(start + position - length))
+            if best is None or key > best[0]:
+                best = (key, (start, position))
+        start = None
+    
+    return best[1] if best else None
+
+
+def _expand(box: Tuple[int, int, int, int], margin: int,
+            limits: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """Grow a box by a margin without leaving the limits"""
+    return (
+        max(box[0] - margin, limits[0]),
+        max(box[1] - margin, limits[1]),
+        min(box[2] + margin, limits[2]),
+        min(box[3] + margin, limits[3])
+    )
+
+
+def find_label_boxes(image: Image.Image, orientation: Orientation,
+                     dpi: Optional[int] = None) -> Optional[Tuple[Box, Box]]:
+    """Find the two labels of a page, as page fractions in plan_half_regions order
+    
+    The page is split in the widest blank gap near its middle, across the
+    axis plan_half_regions splits, and each side is trimmed to its content
+    plus LABEL_MARGIN_POINTS. Returns None when no such gap separates two
+    labels.
+    """
+    mask = _get_content_mask(image)
+    width, height = mask.size
+    axis = 0 if orientation == Orientation.LANDSCAPE else 1
+    
+    gap = _find_gap(_get_profile(mask, axis))
+    if gap is None:
+        return None
+    split = (gap[0] + gap[1]) // 2
+    
+    if axis == 1:
+        sides = ((0, 0, width, split), (0, split, width, height))
+    else:
+        # A landscape page is turned counter-clockwise, its right part goes on top
+        sides = ((split, 0, width, height), (0, 0, split, height))
+    
+    margin = round(config.LABEL_MARGIN_POINTS * (dpi or config.PREVIEW_DPI) / 72)
+    boxes = []
+    for side in sides:
+        content = mask.crop(side).getbbox()
+        if content is None:
+            return None
+        left, upper, right, lower = _expand(
+            (content[0] + side[0], content[1] + side[1], content[2] + side[0], content[3] + side[1]),
+            margin, side
+        )
+        boxes.append((left / width, upper / height, right / width, lower / height))
+    return boxes[0], boxes[1]
+
+
+def detect_orientation(image: Image.Image) -> Orientation:
+    """Guess how a page holds its two labels from where its content lies
+    
+    Labels side by side leave a wider blank gap between columns than between
+    rows, the page is then turned (LANDSCAPE). Without any gap, pages wider
+    than tall are turned; the image is rendered from the MediaBox with
+    /Rotate applied, so its shape is the displayed page shape.
+    """
+    mask = _get_content_mask(image)
+    width, height = mask.size
+    
+    gaps = []
+    for axis, length in ((1, height), (0, width)):
+        gap = _find_gap(_get_profile(mask, axis))
+        gaps.append((gap[1] - gap[0]) / length if gap else 0.0)
+    row_gap, column_gap = gaps
+    
+    if row_gap == column_gap:
+        return Orientation.LANDSCAPE if width > height else Orientation.PORTRAIT
+    return Orientation.LANDSCAPE if column_gap > row_gap else Orientation.PORTRAIT
\ No newline at end of file
@@ -0,0 +1,293 @@
+"""
+Page geometry planning for the combine pipeline
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..exceptions import ValidationError
+from ..models import Orientation
+
+Box = Tuple[float, float, float, float]  # left, upper, right, lower
+
+# A4 in points
+A4_SIZE_POINTS = (595.276, 841.89)
+
+
+@dataclass(frozen=True)
+class SourceRegion:
+    """Region of a source page and the rotation that maps it into an output half"""
+    box: Box
+    rotation: int = 0  # Degrees counter-clockwise, multiple of 90
+    
+    @property
+    def width(self) -> float:
+        """Get region width before rotation"""
+        return self.box[2] - self.box[0]
+    
+    @property
+    def height(self) -> float:
+        """Get region height before rotation"""
+        return self.box[3] - self.box[1]
+    
+    @property
+    def output_size(self) -> Tuple[float, float]:
+        """Get region size once rotated into the output"""
+        if self.rotation % 180:
+            return self.height, self.width
+        return self.width, self.height
+    
+    def rotated(self, rotation: int) -> "SourceRegion":
+        """Get the same region turned by a further rotation"""
+        return SourceRegion(self.box, (self.rotation + rotation) % 360)
+
+
+def _half(length: float) -> float:
+    """Get half of a length, rounded down for pixel sizes like crop_image_half"""
+    return length // 2 if isinstance(length, int) else length / 2
+
+
+def plan_half_regions(width: float, height: float,
+                      orientation: Orientation) -> Tuple[SourceRegion, SourceRegion]:
+    """Work out which source regions end up in the top and bottom output halves
+    
+    Coordinates are in the unrotated source page space (pixels or points), so
+    each half can be extracted or rendered on its own without first rotating
+    the whole page.
+    """
+    if orientation == Orientation.LANDSCAPE:
+        # A page rotated 90° counter-clockwise has its right part on top
+        split = width - _half(width)
+        return (
+            SourceRegion((split, 0, width, height), rotation=90),
+            SourceRegion((0, 0, split, height), rotation=90)
+        )
+    
+    split = _half(height)
+    return (
+        SourceRegion((0, 0, width, split)),
+        SourceRegion((0, split, width, height))
+    )
+
+
+def plan_label_regions(size: Tuple[float, float], orientation: Orientation,
+                       label_boxes: Tuple[Box, Box], source_box: Optional[Box] = None) -> Tuple[SourceRegion, SourceRegion]:
+    """Map two detected label boxes into regions of a source image
+    
+    Boxes are page fractions, in plan_half_regions order. The source image
+    covers source_box of the page (page fractions, the whole page by
+    default), like a page rendered with render_region.
+    """
+    left, upper, right, lower = source_box or (0, 0, 1, 1)
+    width, height = size
+    page_width, page_height = width / (right - left), height / (lower - upper)
+    
+    def to_source(box: Box) -> Box:
+        values = (
+            (box[0] - left) * page_width,
+            (box[1] - upper) * page_height,
+            (box[2] - left) * page_width,
+            (box[3] - upper) * page_height
+        )
+        if isinstance(width, int):
+            # Whole pixels, clamped against rounding past the rendered area
+            values = tuple(min(max(round(value), 0), limit) for value, limit in zip(values, size * 2))
+        return values
+    
+    rotation = 90 if orientation == Orientation.LANDSCAPE else 0
+    first, second = label_boxes
+    return SourceRegion(to_source(first), rotation), SourceRegion(to_source(second), rotation)
+
+
+def union_box(regions: Sequence[SourceRegion]) -> Box:
+    """Get the bounding box of all regions"""
+    return (
+        min(region.box[0] for region in regions),
+        min(region.box[1] for region in regions),
+        max(region.box[2] for region in regions),
+        max(region.box[3] for region in regions)
+    )
+
+
+@dataclass(frozen=True)
+class Placement:
+    """One source region written into an output canvas"""
+    source: int  # Index of the source page
+    region: SourceRegion
+    position: Tuple[float, float]  # Top-left corner in the output
+    size: Tuple[float, float]  # Size in the output, after rotation and scaling
+    
+    @property
+    def box(self) -> Box:
+        """Get the destination box in the output"""
+        x, y = self.position
+        width, height = self.size
+        return x, y, x + width, y + height
+
+
+@dataclass(frozen=True)
+class CompositionPlan:
+    """Output canvas size and where each source region goes"""
+    size: Tuple[float, float]
+    placements: Tuple[Placement, ...]
+
+
+@dataclass(frozen=True)
+class Cell:
+    """Slot of a sheet, as fractions of the sheet size"""
+    box: Box
+    rotation: int = 0  # Further rotation of the region placed here, counter-clockwise
+
+
+@dataclass(frozen=True)
+class SheetLayout:
+    """How source regions are imposed on output sheets, one region per cell
+    
+    Without a size, the rows and columns of each sheet are sized from their
+    content, so regions keep their resolution. "stretch" fills each cell,
+    "contain" keeps the region aspect ratio and centres it.
+    """
+    name: str
+    cells: Tuple[Cell, ...]
+    size: Optional[Tuple[float, float]] = None  # Sheet size in points
+    fit: str = "stretch"
+    
+    @property
+    def capacity(self) -> int:
+        """Get the number of regions per sheet"""
+        return len(self.cells)
+
+
+def grid_cells(rows: int, columns: int, rotation: int = 0) -> Tuple[Cell, ...]:
+    """Split a sheet into a grid of equal cells, filled row by row"""
+    return tuple(
+        Cell((column / columns, row / rows, (column + 1) / columns, (row + 1) / rows), rotation)
+        for row in range(rows)
+        for column in range(columns)
+    )
+
+
+# Two half pages stacked on a sheet sized like the sources (the original tops/bottoms output)
+HALVES_LAYOUT = SheetLayout("halves", grid_cells(2, 1))
+
+# Four A6 labels on an A4 sheet
+A6_4UP_LAYOUT = SheetLayout("a6-4up", grid_cells(2, 2), size=A4_SIZE_POINTS, fit="contain")
+
+# Detected labels keep their aspect ratio, centred in rows as large as the largest one
+LABELS_LAYOUT = SheetLayout("labels", grid_cells(2, 1), fit="contain")
+
+LAYOUT_PRESETS: Dict[str, SheetLayout] = {
+    layout.name: layout for layout in (HALVES_LAYOUT, A6_4UP_LAYOUT)
+}
+
+
+def get_layout(name: str) -> SheetLayout:
+    """Get a layout preset by name"""
+    try:
+        return LAYOUT_PRESETS[name]
+    except KeyError:
+        raise ValidationError(f"Unknown sheet layout: {name}")
+
+
+def plan_page_region(width: float, height: float, orientation: Orientation) -> SourceRegion:
+    """Get a whole page as one region, turned like apply_orientation_transform
+    
+    Orientation.AUTO turns landscape-shaped pages.
+    """
+    turned = orientation == Orientation.LANDSCAPE or (orientation == Orientation.AUTO and width > height)
+    return SourceRegion((0, 0, width, height), rotation=90 if turned else 0)
+
+
+def _get_edge_positions(cells: Sequence[Cell], regions: Sequence[SourceRegion],
+                        axis: int, length: Optional[float]) -> Dict[float, float]:
+    """Map the cell edge fractions along one axis (0 = x, 1 = y) to sheet positions
+    
+    With no sheet length, each track between two edges is as long as the
+    largest region it holds, like rows and columns of a table.
+    """
+    fractions = sorted({cell.box[axis] for cell in cells} | {cell.box[axis + 2] for cell in cells})
+    if length is not None:
+        return {fraction: fraction * length for fraction in fractions}
+    
+    tracks = [0] * (len(fractions) - 1)
+    for cell, region in zip(cells, regions):
+        first, last = fractions.index(cell.box[axis]), fractions.index(cell.box[axis + 2])
+        track_length = region.output_size[axis] / (last - first)  # Spanning cells share their length
+        for track in range(first, last):
+            tracks[track] = max(tracks[track], track_length)
+    return {fraction: sum(tracks[:index]) for index, fraction in enumerate(fractions)}
+
+
+def impose(layout: SheetLayout, regions: Sequence[Tuple[int, SourceRegion]],
+           scale: float = 1.0) -> List[CompositionPlan]:
+    """Fill sheets in order with (source index, region) pairs, one per cell
+    
+    scale converts the layout size from points to source units (DPI / 72 for
+    pixels). A partial last sheet keeps its remaining cells empty.
+    """
+    plans = []
+    for start in range(0, len(regions), layout.capacity):
+        sheet_regions = [
+            (source, region.rotated(cell.rotation))
+            for cell, (source, region) in zip(layout.cells, regions[start:start + layout.capacity])
+        ]
+        
+        sizes = [value * scale for value in layout.size] if layout.size else [None, None]
+        x_positions, y_positions = (
+            _get_edge_positions(layout.cells, [region for _, region in sheet_regions], axis, sizes[axis])
+            for axis in (0, 1)
+        )
+        
+        placements = []
+        for cell, (source, region) in zip(layout.cells, sheet_regions):
+            left, top = x_positions[cell.box[0]], y_positions[cell.box[1]]
+            cell_width, cell_height = x_positions[cell.box[2]] - left, y_positions[cell.box[3]] - top
+            
+            if layout.fit == "contain":
+                region_width, region_height = region.output_size
+                factor = min(cell_width / region_width, cell_height / region_height)
+                size = (region_width * factor, region_height * factor)
+                position = (left + (cell_width - size[0]) / 2, top + (cell_height - size[1]) / 2)
+            else:
+                size = (cell_width, cell_height)
+                position = (left, top)
+            
+            placements.append(Placement(source, region, position, size))
+        
+        plans.append(CompositionPlan((max(x_positions.values()), max(y_positions.values())), tuple(placements)))
+    return plans
+
+
+def scale_plan(plan: CompositionPlan, factor: float) -> CompositionPlan:
+    """Scale a plan's output, keeping the source regions (edges are rounded so pieces stay adjacent)"""
+    def scale_box(box: Box) -> Box:
+        return tuple(round(value * factor) for value in box)
+    
+    placements = []
+    for placement in plan.placements:
+        left, top, right, bottom = scale_box(placement.box)
+        placements.append(Placement(placement.source, placement.region, (left, top), (right - left, bottom - top)))
+    
+    width, height = plan.size
+    return CompositionPlan((round(width * factor), round(height * factor)), tuple(placements))
+
+
+def plan_combination(size1: Tuple[float, float], orientation1: Orientation,
+                     size2: Tuple[float, float], orientation2: Orientation,
+                     label_boxes: Sequence[Optional[Tuple[Box, Box]]] = (None, None),
+                     source_boxes: Sequence[Optional[Box]] = (None, None)) -> Tuple[CompositionPlan, CompositionPlan]:
+    """Plan the tops and bottoms outputs of two source pages in one geometric pass
+    
+    A page with detected labels (see plan_label_regions) contributes only
+    them, the others are split in halves.
+    """
+    (top1, bottom1), (top2, bottom2) = (
+        plan_label_regions(size, orientation, boxes, source_box) if boxes
+        else plan_half_regions(*size, orientation)
+        for size, orientation, boxes, source_box in zip(
+            (size1, size2), (orientation1, orientation2), label_boxes, source_boxes
+        )
+    )
+    layout = LABELS_LAYOUT if any(label_boxes) else HALVES_LAYOUT
+    top_plan, bottom_plan = impose(layout, [(0, top1), (1, top2), (0, bottom1), (1, bottom2)])
+    return top_plan, bottom_plan
\ No newline at end of file
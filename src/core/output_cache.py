@@ -0,0 +1,119 @@
+"""
+Content-addressed manifest of exported outputs, to skip pairs already produced
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..config import config
+from ..utils import atomic_write, get_file_hash, get_temp_path, get_user_cache_dir
+
+
+class OutputCache:
+    """Map a combination key to the files a previous export produced
+    
+    Each manifest entry is a small JSON file named after its key, listing the
+    output paths with their size and modification time. An entry is only used
+    while those files are unchanged; outputs are never stored twice, a hit
+    hardlinks (or copies) the recorded files to the new destinations.
+    """
+    
+    EXTENSION = '.json'
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or config.OUTPUT_CACHE_DIR or os.path.join(
+            get_user_cache_dir(config.CACHE_APP_NAME), 'outputs'
+        )
+        self.hits = 0
+        self.misses = 0
+    
+    def make_key(self, inputs: Sequence[Tuple[Optional[str], int]], **options: Any) -> str:
+        """Build key from the inputs' content and page (None path is a blank page) and export options"""
+        payload = json.dumps({
+            'inputs': [
+                [get_file_hash(file_path), page] if file_path else None
+                for file_path, page in inputs
+            ],
+            'options': options
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _entry_path(self, key: str) -> str:
+        """Get path of manifest entry"""
+        return os.path.join(self.cache_dir, key + self.EXTENSION)
+    
+    def get(self, key: str) -> Optional[List[str]]:
+        """Get the recorded outputs if they are all unchanged, or None on miss"""
+        paths = self.peek(key)
+        if paths is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return paths
+    
+    def peek(self, key: str) -> Optional[List[str]]:
+        """Like get, without counting a hit or a miss"""
+        try:
+            with open(self._entry_path(key), encoding='utf-8') as f:
+                outputs = json.load(f)['outputs']
+            for output in outputs:
+                stat = os.stat(output['path'])
+                if (stat.st_size, stat.st_mtime_ns) != (output['size'], output['mtime_ns']):
+                    raise ValueError("Output changed since it was recorded")
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return [output['path'] for output in outputs]
+    
+    def put(self, key: str, paths: Sequence[str]) -> None:
+        """Record the outputs produced for a key"""
+        try:
+            outputs = []
+            for path in paths:
+                stat = os.stat(path)
+                outputs.append({'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+            
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with atomic_write(self._entry_path(key), 'w', encoding='utf-8') as f:
+                json.dump({'outputs': outputs}, f)
+        except OSError:
+            pass  # The cache is best effort, exporting must not fail because of it
+    
+    def clear(self) -> None:
+        """Remove all manifest entries (the outputs themselves are kept)"""
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(self.EXTENSION):
+                        os.remove(entry.path)
+        except OSError:
+            pass
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters"""
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+def link_output(source: str, destination: str) -> None:
+    """Hardlink source to destination, copying when links are not possible"""
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        return
+    
+    temp_path = get_temp_path(destination)
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        shutil.copy2(source, temp_path)  # Other filesystem, or no hardlink support
+    os.replace(temp_path, destination)
+
+
+def unlink_shared_output(path: str) -> None:
+    """Remove a file hardlinked elsewhere, so writing a new export there leaves the other links intact"""
+    try:
+        if os.stat(path).st_nlink > 1:
+            os.remove(path)
+    except OSError:
+        pass
\ No newline at end of file
@@ -3,22 +3,42 @@ PDF processing core functionality
 """
 
 import os
-from typing import Optional, Tuple
+import threading
+from dataclasses import replace
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from PIL import Image
-from pdf2image import convert_from_path
 
-from ..models import PDFDocument, CombinedDocument, ExportConfig, Orientation
+from ..models import PDFDocument, CombinedDocument, ExportConfig, ExportSnapshot, Orientation, PageSource, SolidFill
 from ..config import config
-from ..exceptions import PDFLoadError, ValidationError, ImageProcessingError
+from ..exceptions import PDFLoadError, ValidationError, ImageProcessingError, OperationCancelledError
 from ..utils import (
     validate_pdf_file,
     create_blank_image,
-    apply_orientation_transform,
-    crop_image_half,
-    combine_images_vertically,
+    get_preview_size,
     save_image_with_format,
-    resize_image_for_preview
+    resize_image_for_preview,
+    downscale_image
 )
+from .cancellation import CancellationToken, PreviewCallback, ProgressCallback, wait_for_future
+from .compositor import compose_plan, configure_image_memory
+from .label_detection import detect_orientation, find_label_boxes
+from .layout import (
+    Box,
+    CompositionPlan,
+    SheetLayout,
+    SourceRegion,
+    impose,
+    plan_combination,
+    plan_page_region,
+    scale_plan,
+    union_box
+)
+from .output_cache import OutputCache, link_output, unlink_shared_output
+from .render_cache import RenderCache
+from .renderers import get_renderer
+from .tracing import Tracer
+from .vector_export import VectorPDFExporter, is_vector_export_available
 
 
 class PDFProcessor:
@@ -28,225 +48,768 @@ class PDFProcessor:
         self.pdf1 = PDFDocument()
         self.pdf2 = PDFDocument()
         self.combined = CombinedDocument()
+        self.renderer = get_renderer()
+        self.render_cache = RenderCache() if config.RENDER_CACHE_ENABLED else None
+        self.output_cache = OutputCache() if config.OUTPUT_CACHE_ENABLED else None
+        self.tracer = Tracer()
+        configure_image_memory()
+        
+        # Guards the documents, prefetches and combined result, which the UI
+        # thread replaces while a processing job runs in the background
+        self._state_lock = threading.RLock()
+        
+        # Background export resolution renders, by PDF number, with the page area
+        # they cover and the (file, page) they render
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+        self._prefetches: Dict[int, Tuple[Future, CancellationToken, Optional[Box], Tuple[str, int]]] = {}
         
-        # Configure environment to avoid cmd windows
-        self._configure_pdf2image_environment()
+        # Detection results per document: id -> (detection image, orientation, boxes)
+        self._label_cache: Dict[int, Tuple[Image.Image, Orientation, Optional[Tuple[Box, Box]]]] = {}
+        self._orientation_cache: Dict[int, Tuple[Image.Image, Orientation]] = {}
     
-    def _get_poppler_path(self) -> Optional[str]:
-        """Get poppler path for pdf2image"""
-        import sys
+    def _convert_pdf_safe(self, file_path: str, dpi: int, first_page: int = 1, last_page: int = 1,
+                          thread_count: int = 1, cancel_token: Optional[CancellationToken] = None):
+        """Convert PDF pages to images, served from the render cache when possible"""
+        if not self.render_cache:
+            return self._render_pdf(file_path, dpi, first_page, last_page, thread_count, cancel_token)
         
-        # When compiled, poppler is included in the executable
-        if getattr(sys, 'frozen', False):
-            # For compiled executable, return None to use system poppler
-            return None
-        else:
-            # For development, return None to use system poppler
-            return None
+        options = self.renderer.cache_options
+        keys = [
+            self.render_cache.make_key(file_path, page, dpi, **options)
+            for page in range(first_page, last_page + 1)
+        ]
+        
+        images = []
+        with self.tracer.span("cache"):
+            for key in keys:
+                image = self.render_cache.get(key)
+                if image is None:
+                    break
+                images.append(image)
+        if len(images) == len(keys):
+            return images
+        
+        # Render the missing tail of the range and store it
+        first_missing = first_page + len(images)
+        rendered = self._render_pdf(file_path, dpi, first_missing, last_page, thread_count, cancel_token)
+        for key, image in zip(keys[len(images):], rendered):
+            self.render_cache.put(key, image)
+        
+        return images + rendered
     
-    def _configure_pdf2image_environment(self):
-        """Configure environment to avoid cmd windows"""
-        import subprocess
-        import sys
-        import os
-        
-        # Set environment variables to avoid cmd windows
-        if sys.platform == 'win32':
-            # Hide console windows on Windows
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
-            
-            # Set environment variables
-            os.environ['PYTHONHASHSEED'] = '0'
-    
-    def _convert_pdf_safe(self, file_path: str, dpi: int, first_page: int = 1, last_page: int = 1):
-        """Safely convert PDF to images without cmd windows"""
-        import subprocess
-        import sys
-        
-        # Configure subprocess to avoid cmd windows
-        kwargs = {
-            'first_page': first_page,
-            'last_page': last_page,
-            'dpi': dpi,
-            'poppler_path': self._get_poppler_path(),
-            'use_pdftocairo': True,
-            'thread_count': 1
-        }
-        
-        # Add Windows-specific settings to avoid cmd windows
-        if sys.platform == 'win32':
-            # Create a custom environment
-            import os
-            env = os.environ.copy()
-            
-            # Set console creation flags
-            kwargs['fmt'] = 'ppm'  # Use PPM format for better compatibility
+    def _render_region_safe(self, file_path: str, page_number: int, dpi: int, box: Box,
+                            cancel_token: Optional[CancellationToken] = None) -> Image.Image:
+        """Render the box of a page (page fractions), served from the render cache when possible"""
+        key = None
+        if self.render_cache:
+            key = self.render_cache.make_key(file_path, page_number, dpi, box=box, **self.renderer.cache_options)
+            with self.tracer.span("cache"):
+                image = self.render_cache.get(key)
+            if image is not None:
+                return image
+        
+        with self.tracer.span("render") as span:
+            width, height = self.renderer.get_page_size(file_path, page_number)
+            image = self.renderer.render_region(
+                file_path, dpi, page_number,
+                (box[0] * width, box[1] * height, box[2] * width, box[3] * height),
+                cancel_token=cancel_token
+            )
+            self.tracer.add_pixels(span, image)
         
-        return convert_from_path(file_path, **kwargs)
+        if key:
+            self.render_cache.put(key, image)
+        return image
     
-    def load_pdf_from_file(self, file_path: str, pdf_number: int) -> None:
-        """Load PDF from file path"""
+    def _render_pdf(self, file_path: str, dpi: int, first_page: int = 1, last_page: int = 1,
+                    thread_count: int = 1, cancel_token: Optional[CancellationToken] = None):
+        """Render PDF pages with the configured backend"""
+        with self.tracer.span("render") as span:
+            images = self.renderer.render(file_path, dpi, first_page, last_page, thread_count,
+                                          cancel_token=cancel_token)
+            self.tracer.add_pixels(span, *images)
+        return images
+    
+    def _get_preview_reduce_factor(self) -> int:
+        """Get integer reduction factor from export DPI to preview DPI"""
+        return max(1, round(config.EXPORT_DPI / config.PREVIEW_DPI))
+    
+    def load_pdf_from_file(self, file_path: str, pdf_number: int, render: bool = True,
+                           page_number: int = 1, cancel_token: Optional[CancellationToken] = None,
+                           prefetch: bool = False) -> None:
+        """Load PDF page from file path (render=False skips rasterizing, e.g. for vector export)
+        
+        prefetch=True renders only the preview now and starts the export
+        resolution render in the background, whatever RENDER_POLICY says.
+        """
         if not validate_pdf_file(file_path):
             raise PDFLoadError(f"Invalid PDF file: {file_path}")
         
+        self._cancel_prefetch(pdf_number)
         try:
-            # Load preview (low resolution)
-            preview_images = self._convert_pdf_safe(
-                file_path, 
-                dpi=config.PREVIEW_DPI,
-                first_page=1, 
-                last_page=1
-            )
+            if not render:
+                hires_image = None
+                preview_image = None
+            elif config.RENDER_POLICY == "single" and not prefetch:
+                # Render once at export resolution and derive the preview from it
+                images = self._convert_pdf_safe(
+                    file_path,
+                    dpi=config.EXPORT_DPI,
+                    first_page=page_number,
+                    last_page=page_number,
+                    cancel_token=cancel_token
+                )
+                if not images:
+                    raise PDFLoadError("No pages found in PDF")
+                
+                hires_image = images[0]
+                with self.tracer.span("preview") as span:
+                    preview_image = downscale_image(hires_image, self._get_preview_reduce_factor())
+                    self.tracer.add_pixels(span, preview_image)
+            else:
+                # Load preview (low resolution)
+                preview_images = self._convert_pdf_safe(
+                    file_path, 
+                    dpi=config.PREVIEW_DPI,
+                    first_page=page_number, 
+                    last_page=page_number,
+                    cancel_token=cancel_token
+                )
+                
+                if not preview_images:
+                    raise PDFLoadError("No pages found in PDF")
+                
+                hires_image = None  # Will be loaded when needed
+                preview_image = preview_images[0]
             
-            if not preview_images:
-                raise PDFLoadError("No pages found in PDF")
-            
-            # Store the document
-            pdf_doc = self.pdf1 if pdf_number == 1 else self.pdf2
-            pdf_doc.file_path = file_path
-            pdf_doc.is_blank = False
-            pdf_doc.preview_image = preview_images[0]
-            pdf_doc.hires_image = None  # Will be loaded when needed
+            # Store a new document, a running job keeps the one it started with
+            with self._state_lock:
+                pdf_doc = PDFDocument(
+                    file_path=file_path,
+                    page_number=page_number,
+                    orientation=self._get_document(pdf_number).orientation,
+                    preview_image=preview_image,
+                    hires_image=hires_image
+                )
+                self._set_document(pdf_number, pdf_doc)
+                
+                if render and prefetch:
+                    self._start_prefetch(pdf_number, pdf_doc)
             
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise PDFLoadError(f"Failed to load PDF: {str(e)}")
     
+    def _get_document(self, pdf_number: int) -> PDFDocument:
+        """Get the current document of a PDF number"""
+        return self.pdf1 if pdf_number == 1 else self.pdf2
+    
+    def _set_document(self, pdf_number: int, document: PDFDocument) -> None:
+        """Replace the document of a PDF number (with the state lock held)"""
+        previous = self._get_document(pdf_number)
+        self._label_cache.pop(id(previous), None)
+        self._orientation_cache.pop(id(previous), None)
+        if pdf_number == 1:
+            self.pdf1 = document
+        else:
+            self.pdf2 = document
+    
+    def _start_prefetch(self, pdf_number: int, document: PDFDocument) -> None:
+        """Render a page at export resolution in the background"""
+        token = CancellationToken()
+        file_path, page_number = document.file_path, document.page_number
+        box = self._get_render_box(document)
+        
+        def render() -> Optional[Image.Image]:
+            token.raise_if_cancelled()
+            return self._render_hires_image(file_path, page_number, box, token)
+        
+        with self._state_lock:
+            self._prefetches[pdf_number] = (self._prefetch_executor.submit(render), token, box, (file_path, page_number))
+    
+    def _get_prefetch(self, pdf_number: int, document: PDFDocument):
+        """Get the background render of a document, None if there is none or it renders another page"""
+        with self._state_lock:
+            prefetch = self._prefetches.get(pdf_number)
+        if prefetch and prefetch[3] == (document.file_path, document.page_number):
+            return prefetch
+        return None
+    
+    def _cancel_prefetch(self, pdf_number: int, prefetch=None) -> None:
+        """Drop the background render of a PDF whose selection changed (only prefetch when given)"""
+        with self._state_lock:
+            current = self._prefetches.get(pdf_number)
+            if current is None or (prefetch is not None and current is not prefetch):
+                return
+            del self._prefetches[pdf_number]
+        current[1].cancel()
+    
     def load_blank_page(self, pdf_number: int) -> None:
         """Load blank page"""
+        self._cancel_prefetch(pdf_number)
         try:
-            blank_image = create_blank_image(
-                config.A4_WIDTH_300DPI, 
-                config.A4_HEIGHT_300DPI
-            )
-            
-            # Create preview version
-            preview_image = resize_image_for_preview(
-                blank_image, 
-                config.PREVIEW_MAX_SIZE
+            # Only the small preview is allocated, the page itself is a lazy fill
+            blank_page = SolidFill((config.A4_WIDTH_300DPI, config.A4_HEIGHT_300DPI), self.renderer.color_mode)
+            preview_image = create_blank_image(
+                *get_preview_size(blank_page.size, config.PREVIEW_MAX_SIZE),
+                'L' if blank_page.mode == '1' else blank_page.mode
             )
             
-            # Store the document
-            pdf_doc = self.pdf1 if pdf_number == 1 else self.pdf2
-            pdf_doc.file_path = None
-            pdf_doc.is_blank = True
-            pdf_doc.preview_image = preview_image
-            pdf_doc.hires_image = blank_image
+            # Store a new document, a running job keeps the one it started with
+            with self._state_lock:
+                self._set_document(pdf_number, PDFDocument(
+                    is_blank=True,
+                    orientation=self._get_document(pdf_number).orientation,
+                    preview_image=preview_image,
+                    hires_image=blank_page
+                ))
             
         except Exception as e:
             raise PDFLoadError(f"Failed to create blank page: {str(e)}")
     
     def set_orientation(self, pdf_number: int, orientation: Orientation) -> None:
-        """Set PDF orientation"""
-        pdf_doc = self.pdf1 if pdf_number == 1 else self.pdf2
-        pdf_doc.orientation = orientation
+        """Set PDF orientation (Orientation.AUTO detects it from the page)"""
+        with self._state_lock:
+            previous = self._get_document(pdf_number)
+            caches = [(cache, cache.get(id(previous))) for cache in (self._orientation_cache, self._label_cache)]
+            pdf_doc = replace(previous, orientation=orientation)
+            self._set_document(pdf_number, pdf_doc)
+            # Both caches check the orientation they were computed for
+            for cache, cached in caches:
+                if cached:
+                    cache[id(pdf_doc)] = cached
+    
+    def get_orientation(self, pdf_number: int) -> Orientation:
+        """Get the orientation applied to a PDF, detected when set to auto"""
+        return self._get_orientations()[pdf_number - 1]
+    
+    def _get_orientation(self, document: PDFDocument) -> Orientation:
+        """Get the orientation of a page, detecting it for Orientation.AUTO"""
+        if document.orientation != Orientation.AUTO:
+            return document.orientation
+        if document.is_blank or not document.file_path:
+            return Orientation.PORTRAIT
+        
+        image = self._get_detection_image(document)
+        if image is None:
+            return Orientation.PORTRAIT
+        
+        cached = self._orientation_cache.get(id(document))
+        if cached and cached[0] is image:
+            return cached[1]
+        
+        with self.tracer.span("detect"):
+            orientation = detect_orientation(image)
+        self._orientation_cache[id(document)] = (image, orientation)
+        return orientation
+    
+    def _get_orientations(self, documents: Optional[Sequence[PDFDocument]] = None) -> Tuple[Orientation, Orientation]:
+        """Get the orientations of pdf1 and pdf2, a blank page on auto follows the other page"""
+        documents = documents or (self.pdf1, self.pdf2)
+        orientations = [self._get_orientation(document) for document in documents]
+        for index, document in enumerate(documents):
+            if document.is_blank and document.orientation == Orientation.AUTO:
+                orientations[index] = orientations[1 - index]
+        return orientations[0], orientations[1]
     
     def get_preview_image(self, pdf_number: int) -> Optional[Image.Image]:
         """Get preview image for PDF"""
         pdf_doc = self.pdf1 if pdf_number == 1 else self.pdf2
         return pdf_doc.preview_image
     
-    def load_hires_images(self) -> None:
-        """Load high resolution images for processing"""
-        try:
-            # Load PDF1 hires if not already loaded
-            if not self.pdf1.hires_image:
-                if self.pdf1.is_blank:
-                    self.pdf1.hires_image = create_blank_image(
-                        config.A4_WIDTH_300DPI, 
-                        config.A4_HEIGHT_300DPI
-                    )
-                elif self.pdf1.file_path:
-                    images = self._convert_pdf_safe(
-                        self.pdf1.file_path, 
-                        dpi=config.EXPORT_DPI,
-                        first_page=1, 
-                        last_page=1
-                    )
-                    self.pdf1.hires_image = images[0] if images else None
+    def _get_detection_image(self, document: PDFDocument) -> Optional[Image.Image]:
+        """Get the low resolution page used to find labels, rendering it if needed"""
+        if document.preview_image is None and document.file_path:
+            if isinstance(document.hires_image, Image.Image) and not document.hires_box:
+                with self.tracer.span("preview") as span:
+                    document.preview_image = downscale_image(document.hires_image, self._get_preview_reduce_factor())
+                    self.tracer.add_pixels(span, document.preview_image)
+            else:
+                images = self._convert_pdf_safe(
+                    document.file_path,
+                    dpi=config.PREVIEW_DPI,
+                    first_page=document.page_number,
+                    last_page=document.page_number
+                )
+                document.preview_image = images[0] if images else None
+        return document.preview_image
+    
+    def _get_label_boxes(self, document: PDFDocument) -> Optional[Tuple[Box, Box]]:
+        """Find the two labels of a page for its orientation (None splits it in halves)"""
+        if not config.LABEL_DETECTION or document.is_blank or not document.file_path:
+            return None
+        image = self._get_detection_image(document)
+        if image is None:
+            return None
+        
+        orientation = self._get_orientation(document)
+        cached = self._label_cache.get(id(document))
+        if cached and cached[0] is image and cached[1] == orientation:
+            return cached[2]
+        
+        with self.tracer.span("detect"):
+            label_boxes = find_label_boxes(image, orientation)
+        self._label_cache[id(document)] = (image, orientation, label_boxes)
+        return label_boxes
+    
+    def _get_render_box(self, document: PDFDocument) -> Optional[Box]:
+        """Get the page area holding the labels, None when the whole page is needed
+        
+        The box bounds all the content, so it also holds the labels found
+        after an orientation change.
+        """
+        label_boxes = self._get_label_boxes(document)
+        if not label_boxes:
+            return None
+        return union_box([SourceRegion(box) for box in label_boxes])
+    
+    def _render_hires_image(self, file_path: str, page_number: int, box: Optional[Box] = None,
+                            cancel_token: Optional[CancellationToken] = None) -> Optional[Image.Image]:
+        """Render a page at export resolution, only its box (page fractions) when given"""
+        if box:
+            return self._render_region_safe(file_path, page_number, config.EXPORT_DPI, box, cancel_token)
+        
+        images = self._convert_pdf_safe(
+            file_path, 
+            dpi=config.EXPORT_DPI,
+            first_page=page_number, 
+            last_page=page_number,
+            cancel_token=cancel_token
+        )
+        return images[0] if images else None
+    
+    def load_hires_images(self, cancel_token: Optional[CancellationToken] = None,
+                          documents: Optional[Sequence[PDFDocument]] = None,
+                          progress: Optional[Callable[[float], None]] = None) -> None:
+        """Load high resolution images for processing, rendering both PDFs concurrently
+        
+        documents defaults to the current pdf1 and pdf2. progress(fraction)
+        is called as each render finishes. The images are only stored if the
+        token is still current, under the state lock.
+        """
+        with self._state_lock:
+            documents = documents or (self.pdf1, self.pdf2)
+        
+        pending = []
+        for number, document in enumerate(documents, start=1):
+            if document.is_blank or not document.file_path:
+                continue
             
-            # Load PDF2 hires if not already loaded
-            if not self.pdf2.hires_image:
-                if self.pdf2.is_blank:
-                    self.pdf2.hires_image = create_blank_image(
-                        config.A4_WIDTH_300DPI, 
-                        config.A4_HEIGHT_300DPI
-                    )
-                elif self.pdf2.file_path:
-                    images = self._convert_pdf_safe(
-                        self.pdf2.file_path, 
-                        dpi=config.EXPORT_DPI,
-                        first_page=1, 
-                        last_page=1
-                    )
-                    self.pdf2.hires_image = images[0] if images else None
+            # A render cropped to the labels is useless once the orientation
+            # change means they are no longer found: the whole page is needed
+            prefetch = self._get_prefetch(number, document)
+            stale = bool(document.hires_box or (prefetch and prefetch[2])) and not self._get_render_box(document)
+            if stale and prefetch:
+                self._cancel_prefetch(number, prefetch)
+                prefetch = None
+            if document.hires_image and not stale:
+                continue
+            pending.append((number, document, prefetch))
+        
+        # With poppler each render is its own pdftocairo process, so two
+        # threads are enough to overlap them; pdfium is not thread-safe and
+        # its renders run one after the other behind the renderer lock.
+        # Prefetched pages are only joined, they keep rendering if this job
+        # is cancelled.
+        errors = []
+        results = []
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                futures = []
+                for number, document, prefetch in pending:
+                    if prefetch:
+                        future, _, box, _ = prefetch
+                    else:
+                        box = self._get_render_box(document)
+                        future = executor.submit(
+                            self._render_hires_image, document.file_path, document.page_number, box, cancel_token
+                        )
+                    futures.append((number, document, prefetch, future, box))
+                
+                for done, (number, document, prefetch, future, box) in enumerate(futures, start=1):
+                    try:
+                        results.append((number, document, prefetch, wait_for_future(future, cancel_token), box))
+                    except OperationCancelledError:
+                        pass  # Reported once below
+                    except Exception as e:
+                        errors.append(f"PDF {number}: {str(e)}")
+                    if progress:
+                        progress(done / len(futures))
+        
+        if errors:
+            raise PDFLoadError(f"Failed to load high resolution images: {'; '.join(errors)}")
+        
+        try:
+            with self._state_lock:
+                # A superseded job must not touch the prefetches of the next one
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                for number, document, prefetch, image, box in results:
+                    document.hires_image = image
+                    document.hires_box = box
+                    if prefetch and self._prefetches.get(number) is prefetch:
+                        del self._prefetches[number]
+                
+                # Blank pages take the size of the other page, or A4 when both are blank
+                self._adjust_blank_page_dimensions(documents)
+                for document in documents:
+                    if document.is_blank and not document.hires_image:
+                        document.hires_image = SolidFill(
+                            (config.A4_WIDTH_300DPI, config.A4_HEIGHT_300DPI),
+                            self.renderer.color_mode
+                        )
             
             # Validate images loaded
-            if not self.pdf1.hires_image or not self.pdf2.hires_image:
+            if not all(document.hires_image for document in documents):
                 raise ImageProcessingError("Failed to load high resolution images")
             
-            # Adjust blank page dimensions to match
-            self._adjust_blank_page_dimensions()
-            
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise PDFLoadError(f"Failed to load high resolution images: {str(e)}")
     
-    def _adjust_blank_page_dimensions(self) -> None:
+    def _adjust_blank_page_dimensions(self, documents: Sequence[PDFDocument]) -> None:
         """Adjust blank page dimensions to match PDF dimensions"""
-        if self.pdf1.is_blank and not self.pdf2.is_blank:
+        pdf1, pdf2 = documents
+        if pdf1.is_blank and not pdf2.is_blank:
             # Adjust PDF1 blank page to match PDF2 dimensions
-            width, height = self.pdf2.hires_image.size
-            self.pdf1.hires_image = create_blank_image(width, height)
+            pdf1.hires_image = SolidFill(pdf2.hires_image.size, self.renderer.color_mode)
             
-        elif self.pdf2.is_blank and not self.pdf1.is_blank:
+        elif pdf2.is_blank and not pdf1.is_blank:
             # Adjust PDF2 blank page to match PDF1 dimensions
-            width, height = self.pdf1.hires_image.size
-            self.pdf2.hires_image = create_blank_image(width, height)
+            pdf2.hires_image = SolidFill(pdf1.hires_image.size, self.renderer.color_mode)
+    
+    def _plan_combination(self, size1: Tuple[float, float], size2: Tuple[float, float],
+                          source_boxes: Sequence[Optional[Box]] = (None, None),
+                          documents: Optional[Sequence[PDFDocument]] = None) -> Tuple[CompositionPlan, CompositionPlan]:
+        """Plan the tops and bottoms outputs around the labels found on each page"""
+        documents = documents or (self.pdf1, self.pdf2)
+        orientation1, orientation2 = self._get_orientations(documents)
+        return plan_combination(
+            size1, orientation1,
+            size2, orientation2,
+            label_boxes=[self._get_label_boxes(document) for document in documents],
+            source_boxes=source_boxes
+        )
+    
+    def _live_preview_sources(self) -> Tuple[PageSource, PageSource]:
+        """Get both preview resolution pages, blanks sized like the other page"""
+        reduce_factor = self._get_preview_reduce_factor()
+        sizes = [
+            None if document.is_blank else document.preview_image.size
+            for document in (self.pdf1, self.pdf2)
+        ]
+        fallback = next(
+            (size for size in sizes if size),
+            (config.A4_WIDTH_300DPI // reduce_factor, config.A4_HEIGHT_300DPI // reduce_factor)
+        )
+        return tuple(
+            SolidFill(fallback, self.renderer.color_mode) if document.is_blank
+            else document.preview_image
+            for document in (self.pdf1, self.pdf2)
+        )
+    
+    def preview_combination(self) -> Optional[Tuple[Image.Image, Image.Image]]:
+        """Combine the low resolution pages with the current orientations
+        
+        Runs the same plans as process_combination on the cached preview
+        images, in milliseconds, and returns the (top, bottom) thumbnails.
+        Returns None until both inputs are selected.
+        """
+        if not self.is_ready_to_process():
+            return None
+        
+        try:
+            with self.tracer.span("preview") as span:
+                sources = self._live_preview_sources()
+                plans = self._plan_combination(sources[0].size, sources[1].size)
+                # Compose straight at thumbnail size, no intermediate full canvas
+                max_width, max_height = config.PREVIEW_MAX_SIZE
+                previews = tuple(
+                    compose_plan(
+                        scale_plan(plan, min(max_width / plan.size[0], max_height / plan.size[1], 1.0)),
+                        sources,
+                        config.PREVIEW_REDUCING_GAP
+                    )
+                    for plan in plans
+                )
+                self.tracer.add_pixels(span, *previews)
+            return previews
+            
+        except Exception as e:
+            raise ImageProcessingError(f"Failed to preview combination: {str(e)}")
     
-    def process_combination(self) -> CombinedDocument:
-        """Process PDF combination"""
-        if not self.pdf1.is_loaded or not self.pdf2.is_loaded:
+    def process_combination(self, progress_callback: Optional[ProgressCallback] = None,
+                            cancel_token: Optional[CancellationToken] = None,
+                            preview_callback: Optional[PreviewCallback] = None) -> CombinedDocument:
+        """Process PDF combination
+        
+        progress_callback(fraction, stage) is called at each stage boundary,
+        from the calling thread. Cancelling the token kills in-flight renders
+        and raises OperationCancelledError at the next boundary.
+        preview_callback(top, bottom) receives rough thumbnails as soon as the
+        outputs are composed; the refined ones are stored on the result.
+        The job works on the documents selected when it starts, so loading
+        others meanwhile does not mix them into its result.
+        """
+        with self._state_lock:
+            pdf1, pdf2 = documents = (self.pdf1, self.pdf2)
+        if not pdf1.is_loaded or not pdf2.is_loaded:
             raise ValidationError("Both PDFs must be loaded before processing")
         
+        def report(fraction: float, stage: str) -> None:
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            if progress_callback:
+                progress_callback(fraction, stage)
+        
         try:
             # Load high resolution images
-            self.load_hires_images()
-            
-            # Apply orientation transformations
-            image1 = apply_orientation_transform(
-                self.pdf1.hires_image, 
-                self.pdf1.orientation.value
-            )
-            image2 = apply_orientation_transform(
-                self.pdf2.hires_image, 
-                self.pdf2.orientation.value
+            report(0.0, "render")
+            self.load_hires_images(
+                cancel_token,
+                documents,
+                (lambda fraction: progress_callback(0.7 * fraction, "render")) if progress_callback else None
             )
             
-            # Crop images into halves
-            top_half_pdf1 = crop_image_half(image1, top_half=True)
-            bottom_half_pdf1 = crop_image_half(image1, top_half=False)
-            top_half_pdf2 = crop_image_half(image2, top_half=True)
-            bottom_half_pdf2 = crop_image_half(image2, top_half=False)
+            # Release the previous outputs before allocating the new canvases
+            with self._state_lock:
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                self.combined.top_combined = None
+                self.combined.bottom_combined = None
+                self.combined.top_preview = None
+                self.combined.bottom_preview = None
+            
+            # Plan every rotation, crop and paste up front, then write each
+            # region straight into its preallocated output canvas
+            top_plan, bottom_plan = self._plan_combination(
+                pdf1.hires_image.size,
+                pdf2.hires_image.size,
+                (pdf1.hires_box, pdf2.hires_box),
+                documents
+            )
+            sources = (pdf1.hires_image, pdf2.hires_image)
+            with self.tracer.span("compose") as span:
+                report(0.7, "compose_top")
+                combined_tops = compose_plan(top_plan, sources)
+                report(0.85, "compose_bottom")
+                combined_bottoms = compose_plan(bottom_plan, sources)
+                self.tracer.add_pixels(span, combined_tops, combined_bottoms)
             
-            # Combine top halves (both top halves)
-            combined_tops = combine_images_vertically(top_half_pdf1, top_half_pdf2)
+            if preview_callback:
+                preview_callback(
+                    resize_image_for_preview(combined_tops, config.PREVIEW_MAX_SIZE, fast=True),
+                    resize_image_for_preview(combined_bottoms, config.PREVIEW_MAX_SIZE, fast=True)
+                )
             
-            # Combine bottom halves (both bottom halves)
-            combined_bottoms = combine_images_vertically(bottom_half_pdf1, bottom_half_pdf2)
+            # Thumbnails are made here so the UI thread only receives small images
+            report(0.95, "preview")
+            with self.tracer.span("preview") as span:
+                top_preview = resize_image_for_preview(combined_tops, config.PREVIEW_MAX_SIZE)
+                bottom_preview = resize_image_for_preview(combined_bottoms, config.PREVIEW_MAX_SIZE)
+                self.tracer.add_pixels(span, top_preview, bottom_preview)
             
-            # Store combined images
-            self.combined.top_combined = combined_tops
-            self.combined.bottom_combined = combined_bottoms
+            report(1.0, "done")
             
-            return self.combined
+            # Store combined images, unless a newer job superseded this one
+            with self._state_lock:
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                self.combined = replace(
+                    self.combined,
+                    top_combined=combined_tops,
+                    bottom_combined=combined_bottoms,
+                    top_preview=top_preview,
+                    bottom_preview=bottom_preview
+                )
+                return self.combined
             
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ImageProcessingError(f"Failed to process combination: {str(e)}")
     
-    def export_combined_documents(self, save_directory: str, export_config: ExportConfig) -> Tuple[str, str]:
-        """Export combined documents"""
-        if not self.combined.is_ready:
+    def iter_page_images(self, file_path: str, dpi: Optional[int] = None,
+                         chunk_size: Optional[int] = None) -> Iterator[Tuple[int, Image.Image]]:
+        """Render a document page by page, holding at most one chunk of pages in memory"""
+        dpi = dpi or config.EXPORT_DPI
+        chunk_size = max(1, chunk_size or config.STREAM_CHUNK_PAGES)
+        
+        try:
+            page_count = self.renderer.get_page_count(file_path)
+        except Exception as e:
+            raise PDFLoadError(f"Failed to read page count: {str(e)}")
+        
+        for first_page in range(1, page_count + 1, chunk_size):
+            last_page = min(first_page + chunk_size - 1, page_count)
+            try:
+                images = self._convert_pdf_safe(
+                    file_path,
+                    dpi=dpi,
+                    first_page=first_page,
+                    last_page=last_page,
+                    thread_count=min(config.STREAM_THREAD_COUNT, last_page - first_page + 1)
+                )
+            except Exception as e:
+                raise PDFLoadError(f"Failed to render pages {first_page}-{last_page}: {str(e)}")
+            
+            # Hand pages over one at a time, dropping our reference to each
+            images.reverse()
+            page_number = first_page
+            while images:
+                yield page_number, images.pop()
+                page_number += 1
+    
+    def iter_document_pairs(self, file_path: str,
+                            orientation1: Orientation = Orientation.PORTRAIT,
+                            orientation2: Orientation = Orientation.PORTRAIT,
+                            render: bool = True) -> Iterator[Tuple[int, Optional[int]]]:
+        """Load consecutive pages of a multi-page document as pairs
+        
+        Each step loads the next two pages as pdf1 and pdf2 and yields their
+        page numbers, so the caller can process and export the pair before
+        further pages are rendered. An odd last page is paired with a blank
+        page (yielded as None).
+        """
+        if not validate_pdf_file(file_path):
+            raise PDFLoadError(f"Invalid PDF file: {file_path}")
+        
+        if render:
+            pages = self.iter_page_images(file_path)
+        else:
+            page_count = self.renderer.get_page_count(file_path)
+            pages = ((page_number, None) for page_number in range(1, page_count + 1))
+        
+        pending = None
+        for page in pages:
+            if pending is None:
+                pending = page
+                continue
+            
+            self._load_page_pair(file_path, pending, page, orientation1, orientation2)
+            yield pending[0], page[0]
+            pending = None
+        
+        if pending is not None:
+            self._load_page_pair(file_path, pending, None, orientation1, orientation2)
+            yield pending[0], None
+        
+        self.reset()
+    
+    def _load_page_pair(self, file_path: str, page1: Tuple[int, Optional[Image.Image]],
+                        page2: Optional[Tuple[int, Optional[Image.Image]]],
+                        orientation1: Orientation, orientation2: Orientation) -> None:
+        """Load two already rendered pages of a document as pdf1 and pdf2"""
+        self.reset()
+        self.pdf1 = PDFDocument(
+            file_path=file_path,
+            page_number=page1[0],
+            orientation=orientation1,
+            hires_image=page1[1]
+        )
+        
+        if page2 is None:
+            self.load_blank_page(2)
+            self.pdf2.orientation = orientation2
+        else:
+            self.pdf2 = PDFDocument(
+                file_path=file_path,
+                page_number=page2[0],
+                orientation=orientation2,
+                hires_image=page2[1]
+            )
+    
+    def can_export_vector(self, export_config: ExportConfig) -> bool:
+        """Check if the export can be composed from the source pages without rasterizing"""
+        return (
+            config.VECTOR_PDF_EXPORT
+            and export_config.format_type.upper() == "PDF"
+            and is_vector_export_available()
+        )
+    
+    def _get_output_key(self, export_config: ExportConfig) -> Optional[str]:
+        """Get the output cache key of the loaded pair, None when it cannot be cached"""
+        if not self.output_cache or not self.is_ready_to_process():
+            return None
+        
+        documents = (self.pdf1, self.pdf2)
+        try:
+            return self.output_cache.make_key(
+                [(None if document.is_blank else document.file_path, document.page_number) for document in documents],
+                orientations=[document.orientation.value for document in documents],
+                format_type=export_config.format_type.upper(),
+                quality=export_config.quality,
+                dpi=export_config.dpi,
+                # Settings that change what is rendered and composed
+                vector=self.can_export_vector(export_config),
+                render_dpi=config.EXPORT_DPI,
+                preview_dpi=config.PREVIEW_DPI,
+                render_policy=config.RENDER_POLICY,
+                color_mode=config.PIPELINE_COLOR_MODE,
+                bilevel=[config.BILEVEL_THRESHOLD, config.BILEVEL_DITHER],  # G4 formats and "1" pipelines
+                labels=[config.LABEL_DETECTION, config.LABEL_THRESHOLD,
+                        config.LABEL_MARGIN_POINTS, config.LABEL_SPLIT_RANGE],
+                renderer=self.renderer.cache_options
+            )
+        except OSError:
+            return None
+    
+    def has_cached_outputs(self, export_config: ExportConfig) -> bool:
+        """Check if the loaded pair was already exported with these settings"""
+        key = self._get_output_key(export_config)
+        return bool(key) and self.output_cache.peek(key) is not None
+    
+    def snapshot_export(self, export_config: ExportConfig) -> ExportSnapshot:
+        """Capture the current pair for export_snapshot, from the thread that changes it"""
+        if not self.is_ready_to_process():
+            raise ValidationError("Both PDFs must be loaded before export")
+        
+        vector_export = self.can_export_vector(export_config)
+        documents = None
+        label_boxes = (None, None)
+        if vector_export:
+            sources = (self.pdf1, self.pdf2)
+            label_boxes = tuple(self._get_label_boxes(document) for document in sources)
+            documents = tuple(
+                replace(document, orientation=orientation)
+                for document, orientation in zip(sources, self._get_orientations())
+            )
+        
+        return ExportSnapshot(
+            vector_export=vector_export,
+            top_combined=self.combined.top_combined,
+            bottom_combined=self.combined.bottom_combined,
+            documents=documents,
+            label_boxes=label_boxes,
+            output_key=self._get_output_key(export_config)
+        )
+    
+    def export_combined_documents(self, save_directory: str, export_config: ExportConfig,
+                                  progress_callback: Optional[ProgressCallback] = None) -> Tuple[str, str]:
+        """Export combined documents, encoding the tops and bottoms files in parallel
+        
+        When the same pair was already exported with the same settings, the
+        files recorded in the output cache are linked (or copied) instead;
+        the combined documents are then not needed.
+        progress_callback(fraction, "encode") is called from the calling thread
+        as each file is written.
+        """
+        return self.export_snapshot(self.snapshot_export(export_config), save_directory,
+                                    export_config, progress_callback)
+    
+    def export_snapshot(self, snapshot: ExportSnapshot, save_directory: str, export_config: ExportConfig,
+                        progress_callback: Optional[ProgressCallback] = None) -> Tuple[str, str]:
+        """Export a pair captured by snapshot_export; safe to run while the processor changes"""
+        output_key = snapshot.output_key
+        cached_paths = None
+        if output_key:
+            with self.tracer.span("output_cache"):
+                cached_paths = self.output_cache.get(output_key)
+        
+        ready = snapshot.top_combined is not None and snapshot.bottom_combined is not None
+        if not snapshot.vector_export and not cached_paths and not ready:
             raise ValidationError("Combined documents are not ready for export")
         
         try:
@@ -257,33 +820,140 @@ class PDFProcessor:
             top_path = os.path.join(save_directory, top_filename)
             bottom_path = os.path.join(save_directory, bottom_filename)
             
-            # Save images
-            save_image_with_format(
-                self.combined.top_combined,
-                top_path,
-                export_config.format_type,
-                export_config.quality,
-                export_config.dpi
-            )
+            if cached_paths:
+                with self.tracer.span("output_cache"):
+                    for source, destination in zip(cached_paths, (top_path, bottom_path)):
+                        link_output(source, destination)
+                if progress_callback:
+                    progress_callback(1.0, "encode")
+                return top_path, bottom_path
             
-            save_image_with_format(
-                self.combined.bottom_combined,
-                bottom_path,
-                export_config.format_type,
-                export_config.quality,
-                export_config.dpi
+            # Never write through a hardlink into the outputs of an earlier export
+            for file_path in (top_path, bottom_path):
+                unlink_shared_output(file_path)
+            
+            if snapshot.vector_export:
+                # Compose from the source pages, the raster images are only previews
+                with self.tracer.span("vector_export"):
+                    pdf1, pdf2 = snapshot.documents
+                    VectorPDFExporter().export(pdf1, pdf2, top_path, bottom_path, snapshot.label_boxes)
+                if progress_callback:
+                    progress_callback(1.0, "encode")
+                if output_key:
+                    self.output_cache.put(output_key, (top_path, bottom_path))
+                return top_path, bottom_path
+            
+            # Save images; Pillow's encoders release the GIL, so both files
+            # are encoded at the same time
+            outputs = (
+                (snapshot.top_combined, top_path),
+                (snapshot.bottom_combined, bottom_path)
             )
+            with self.tracer.span("encode"):
+                with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+                    futures = [
+                        executor.submit(
+                            save_image_with_format,
+                            image,
+                            file_path,
+                            export_config.format_type,
+                            export_config.quality,
+                            export_config.dpi
+                        )
+                        for image, file_path in outputs
+                    ]
+                    for done, future in enumerate(as_completed(futures), start=1):
+                        future.result()
+                        if progress_callback:
+                            progress_callback(done / len(futures), "encode")
             
+            if output_key:
+                self.output_cache.put(output_key, (top_path, bottom_path))
             return top_path, bottom_path
             
         except Exception as e:
             raise ImageProcessingError(f"Failed to export documents: {str(e)}")
     
+    def iter_sheet_images(self, documents: Sequence[PDFDocument], layout: SheetLayout) -> Iterator[Image.Image]:
+        """Impose whole pages on the layout's sheets and yield each raster sheet, in order
+        
+        Each sheet is rendered and composed only when the previous one has been
+        consumed, so memory holds a single sheet.
+        """
+        for start in range(0, len(documents), layout.capacity):
+            sheet_documents = documents[start:start + layout.capacity]
+            sources = [
+                SolidFill((config.A4_WIDTH_300DPI, config.A4_HEIGHT_300DPI), self.renderer.color_mode)
+                if document.is_blank
+                else document.hires_image or self._render_hires_image(document.file_path, document.page_number)
+                for document in sheet_documents
+            ]
+            regions = [
+                (index, plan_page_region(*source.size, document.orientation))
+                for index, (source, document) in enumerate(zip(sources, sheet_documents))
+            ]
+            plan = impose(layout, regions, scale=config.EXPORT_DPI / 72)[0]
+            
+            with self.tracer.span("compose") as span:
+                sheet = compose_plan(plan, sources)
+                self.tracer.add_pixels(span, sheet)
+            del sources
+            
+            yield sheet
+    
+    def export_sheets(self, documents: Sequence[PDFDocument], layout: SheetLayout,
+                      save_directory: str, export_config: ExportConfig) -> List[str]:
+        """Impose whole pages on the layout's sheets, in order, and write one file per sheet
+        
+        Files are named after export_config.top_filename, numbered when there
+        are several sheets. Each sheet is encoded before the next one is
+        rendered.
+        """
+        if not documents:
+            raise ValidationError("No documents to impose")
+        
+        sheets = [documents[start:start + layout.capacity] for start in range(0, len(documents), layout.capacity)]
+        paths = []
+        for index in range(len(sheets)):
+            sheet_config = ExportConfig(
+                format_type=export_config.format_type,
+                top_filename=export_config.top_filename if len(sheets) == 1
+                else f"{export_config.top_filename}_{index + 1}"
+            )
+            paths.append(os.path.join(save_directory, sheet_config.get_full_filename(is_top=True)))
+        
+        try:
+            if self.can_export_vector(export_config):
+                with self.tracer.span("vector_export"):
+                    VectorPDFExporter().export_sheets(documents, layout, paths)
+                return paths
+            
+            for sheet, file_path in zip(self.iter_sheet_images(documents, layout), paths):
+                with self.tracer.span("encode"):
+                    save_image_with_format(
+                        sheet,
+                        file_path,
+                        export_config.format_type,
+                        export_config.quality,
+                        export_config.dpi
+                    )
+                del sheet
+            
+            return paths
+            
+        except Exception as e:
+            raise ImageProcessingError(f"Failed to export sheets: {str(e)}")
+    
     def reset(self) -> None:
         """Reset processor state"""
-        self.pdf1 = PDFDocument()
-        self.pdf2 = PDFDocument()
-        self.combined = CombinedDocument()
+        with self._state_lock:
+            for pdf_number in list(self._prefetches):
+                self._cancel_prefetch(pdf_number)
+            self.pdf1 = PDFDocument()
+            self.pdf2 = PDFDocument()
+            self.combined = CombinedDocument()
+            self._label_cache.clear()
+            self._orientation_cache.clear()
     
     def is_ready_to_process(self) -> bool:
         """Check if processor is ready to process"""
@@ -0,0 +1,161 @@
+"""
+Persistent content-addressed cache for rendered pages
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image
+
+from ..config import config
+from ..utils import atomic_write, get_file_hash, get_user_cache_dir
+
+
+class RenderCache:
+    """On-disk LRU cache of raw page pixel buffers keyed by content hash"""
+    
+    # Entry layout: magic, mode, width, height, then raw pixels
+    HEADER = struct.Struct('<4s8sII')
+    MAGIC = b'PDF2'
+    EXTENSION = '.raw'
+    
+    # Pillow keeps 3-band pixels padded to 4 bytes, stored that way they map without a copy
+    RAW_MODES = {'RGB': 'RGBX'}
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or config.RENDER_CACHE_DIR or os.path.join(
+            get_user_cache_dir(config.CACHE_APP_NAME), 'renders'
+        )
+        self.max_bytes = max_bytes if max_bytes is not None else config.RENDER_CACHE_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+    
+    def make_key(self, file_path: str, page: int, dpi: int, **options: Any) -> str:
+        """Build cache key from file content, page, DPI and render options"""
+        payload = json.dumps({
+            'file': get_file_hash(file_path),
+            'page': page,
+            'dpi': dpi,
+            'options': options
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _entry_path(self, key: str) -> str:
+        """Get path of cache entry"""
+        return os.path.join(self.cache_dir, key + self.EXTENSION)
+    
+    def get(self, key: str) -> Optional[Image.Image]:
+        """Get cached image, memory-mapped from disk, or None on miss"""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        
+        try:
+            magic, mode, width, height = self.HEADER.unpack_from(mapped)
+            if magic != self.MAGIC:
+                raise ValueError("Invalid cache entry")
+            mode = mode.rstrip(b'\0').decode('ascii')
+            pixels = memoryview(mapped)[self.HEADER.size:]
+            image = self._map_image(mode, (width, height), pixels)
+        except (struct.error, ValueError):
+            mapped.close()
+            self._remove(entry_path)
+            self.misses += 1
+            return None
+        
+        # Mapped images keep the mapping alive, others were copied
+        del pixels
+        try:
+            mapped.close()
+        except BufferError:
+            pass
+        
+        # Refresh recency for LRU eviction
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        
+        self.hits += 1
+        return image
+    
+    def _map_image(self, mode: str, size: Tuple[int, int], pixels: memoryview) -> Image.Image:
+        """Wrap raw pixels in an image sharing their buffer when Pillow's layout allows it"""
+        if mode not in self.RAW_MODES:
+            # Image.frombuffer maps L and the other single-layout modes, and copies the rest
+            return Image.frombuffer(mode, size, pixels, 'raw', mode, 0, 1)
+        
+        # Image.frombuffer would copy RGB, but padded pixels are already its memory layout
+        map_buffer = getattr(Image.core, 'map_buffer', None)
+        if map_buffer:
+            try:
+                image = Image.new(mode, (0, 0))._new(map_buffer(pixels, size, 'raw', 0, (mode, 0, 1)))
+                image.readonly = 1
+                return image
+            except (TypeError, ValueError):
+                pass
+        return Image.frombuffer(mode, size, pixels, 'raw', self.RAW_MODES[mode], 0, 1)
+    
+    def put(self, key: str, image: Image.Image) -> None:
+        """Store image in cache and evict least recently used entries"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with atomic_write(self._entry_path(key)) as f:
+                f.write(self.HEADER.pack(self.MAGIC, image.mode.encode('ascii'), image.width, image.height))
+                f.write(image.tobytes('raw', self.RAW_MODES.get(image.mode, image.mode)))
+            self.evict()
+        except OSError:
+            pass  # The cache is best effort, rendering must not fail because of it
+    
+    def evict(self) -> None:
+        """Evict least recently used entries until the cache fits its size cap"""
+        entries = []
+        total_size = 0
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(self.EXTENSION):
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_size += stat.st_size
+        except OSError:
+            return
+        
+        entries.sort()
+        for _, size, entry_path in entries:
+            if total_size <= self.max_bytes:
+                break
+            if self._remove(entry_path):
+                total_size -= size
+    
+    def _remove(self, entry_path: str) -> bool:
+        """Remove cache entry, ignoring entries still in use"""
+        try:
+            os.remove(entry_path)
+            return True
+        except OSError:
+            return False
+    
+    def clear(self) -> None:
+        """Remove all cache entries"""
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(self.EXTENSION):
+                        self._remove(entry.path)
+        except OSError:
+            pass
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters"""
+        return {'hits': self.hits, 'misses': self.misses}
\ No newline at end of file
@@ -0,0 +1,336 @@
+"""
+PDF rasterizer backends
+"""
+
+import io
+import os
+import subprocess
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+from ..config import config
+from ..exceptions import PDFLoadError, ValidationError
+from ..utils import convert_to_bilevel
+from .cancellation import CancellationToken
+
+
+# Pixel modes a renderer can produce: color, grayscale, black and white
+COLOR_MODES = ("RGB", "L", "1")
+
+
+class Renderer(ABC):
+    """Base class for PDF rasterizer backends"""
+    
+    name: str = ""
+    
+    def __init__(self, color_mode: Optional[str] = None):
+        self.color_mode = color_mode or config.PIPELINE_COLOR_MODE
+        if self.color_mode not in COLOR_MODES:
+            raise ValidationError(f"Unsupported color mode: {self.color_mode}")
+    
+    def _to_color_mode(self, image: Image.Image) -> Image.Image:
+        """Convert a rendered image to the pipeline color mode if the backend could not"""
+        if image.mode == self.color_mode:
+            return image
+        if self.color_mode == '1':
+            return convert_to_bilevel(image, config.BILEVEL_THRESHOLD, config.BILEVEL_DITHER)
+        return image.convert(self.color_mode)
+    
+    @abstractmethod
+    def render(self, file_path: str, dpi: int, first_page: int = 1, last_page: int = 1,
+               thread_count: int = 1, cancel_token: Optional[CancellationToken] = None) -> List[Image.Image]:
+        """Render a range of pages (1-based, inclusive) to images in the pipeline color mode"""
+    
+    @abstractmethod
+    def get_page_count(self, file_path: str) -> int:
+        """Get number of pages in document"""
+    
+    @abstractmethod
+    def get_page_size(self, file_path: str, page: int = 1) -> Tuple[float, float]:
+        """Get displayed page size in points (page rotation applied)"""
+    
+    @abstractmethod
+    def render_region(self, file_path: str, dpi: int, page: int,
+                      box: Tuple[float, float, float, float],
+                      cancel_token: Optional[CancellationToken] = None) -> Image.Image:
+        """Render only a region of a page
+        
+        The box is (left, upper, right, lower) in points from the top-left
+        corner of the displayed page.
+        """
+    
+    @property
+    def cache_options(self) -> Dict[str, Any]:
+        """Get render options that affect the output pixels (used in cache keys)"""
+        return {'renderer': self.name, 'color_mode': self.color_mode}
+
+
+class PopplerRenderer(Renderer):
+    """Render through poppler's pdftocairo via pdf2image (one subprocess per call)"""
+    
+    name = "poppler"
+    
+    def __init__(self, color_mode: Optional[str] = None):
+        super().__init__(color_mode)
+        # Configure environment to avoid cmd windows
+        self._configure_pdf2image_environment()
+    
+    def _get_poppler_path(self) -> Optional[str]:
+        """Get poppler path for pdf2image"""
+        # When compiled, poppler is included in the executable
+        if getattr(sys, 'frozen', False):
+            # For compiled executable, return None to use system poppler
+            return None
+        else:
+            # For development, return None to use system poppler
+            return None
+    
+    def _configure_pdf2image_environment(self):
+        """Configure environment to avoid cmd windows"""
+        import subprocess
+        
+        # Set environment variables to avoid cmd windows
+        if sys.platform == 'win32':
+            # Hide console windows on Windows
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startupinfo.wShowWindow = subprocess.SW_HIDE
+            
+            # Set environment variables
+            os.environ['PYTHONHASHSEED'] = '0'
+    
+    def render(self, file_path: str, dpi: int, first_page: int = 1, last_page: int = 1,
+               thread_count: int = 1, cancel_token: Optional[CancellationToken] = None) -> List[Image.Image]:
+        """Safely convert PDF to images without cmd windows (thread_count pdftocairo processes)"""
+        if cancel_token or self.color_mode == '1':
+            # pdf2image hides its subprocesses and has no -mono option, run
+            # pdftocairo directly (it can then be killed on cancellation)
+            return [
+                self._render_page(file_path, dpi, page, cancel_token)
+                for page in range(first_page, last_page + 1)
+            ]
+        
+        # Configure subprocess to avoid cmd windows
+        kwargs = {
+            'first_page': first_page,
+            'last_page': last_page,
+            'dpi': dpi,
+            'poppler_path': self._get_poppler_path(),
+            'use_pdftocairo': True,
+            'thread_count': thread_count,
+            'grayscale': self.color_mode == 'L'
+        }
+        
+        # Add Windows-specific settings to avoid cmd windows
+        if sys.platform == 'win32':
+            # Set console creation flags
+            kwargs['fmt'] = 'ppm'  # Use PPM format for better compatibility
+        
+        return [self._to_color_mode(image) for image in convert_from_path(file_path, **kwargs)]
+    
+    def get_page_count(self, file_path: str) -> int:
+        """Get number of pages from pdfinfo"""
+        return pdfinfo_from_path(file_path, poppler_path=self._get_poppler_path())['Pages']
+    
+    def get_page_size(self, file_path: str, page: int = 1) -> Tuple[float, float]:
+        """Get displayed page size in points from pdfinfo"""
+        info = pdfinfo_from_path(
+            file_path,
+            poppler_path=self._get_poppler_path(),
+            first_page=page,
+            last_page=page
+        )
+        
+        # Keys are "Page size" or "Page    N size" depending on the page range
+        size = next(value for key, value in info.items() if key.startswith('Page') and key.endswith('size'))
+        rotation = next((value for key, value in info.items() if key.startswith('Page') and key.endswith('rot')), '0')
+        width, _, height = size.split()[:3]
+        width, height = float(width), float(height)
+        
+        if int(float(rotation)) % 180:
+            return height, width
+        return width, height
+    
+    def _get_command(self, command: str) -> str:
+        """Get poppler command path"""
+        if sys.platform == 'win32':
+            command += '.exe'
+        poppler_path = self._get_poppler_path()
+        return os.path.join(poppler_path, command) if poppler_path else command
+    
+    def _get_color_args(self) -> List[str]:
+        """Get pdftocairo options producing the pipeline color mode"""
+        return {'L': ['-gray'], '1': ['-mono']}.get(self.color_mode, [])
+    
+    def _run_pdftocairo(self, args: List[str], cancel_token: Optional[CancellationToken] = None) -> bytes:
+        """Run pdftocairo without a console window and return its stdout (killed on cancellation)"""
+        kwargs = {}
+        if sys.platform == 'win32':
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startupinfo.wShowWindow = subprocess.SW_HIDE
+            kwargs['startupinfo'] = startupinfo
+        
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        
+        process = subprocess.Popen(
+            [self._get_command('pdftocairo')] + self._get_color_args() + args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            **kwargs
+        )
+        if cancel_token:
+            cancel_token.add_callback(process.kill)
+        try:
+            stdout, stderr = process.communicate()
+        finally:
+            if cancel_token:
+                cancel_token.remove_callback(process.kill)
+        
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        if process.returncode != 0:
+            raise PDFLoadError(f"pdftocairo failed: {stderr.decode('utf-8', 'ignore').strip()}")
+        return stdout
+    
+    def _render_page(self, file_path: str, dpi: int, page: int,
+                     cancel_token: Optional[CancellationToken] = None) -> Image.Image:
+        """Render one full page with a single pdftocairo process"""
+        data = self._run_pdftocairo([
+            '-png', '-singlefile',
+            '-r', str(dpi),
+            '-f', str(page), '-l', str(page),
+            file_path, '-'
+        ], cancel_token)
+        
+        image = Image.open(io.BytesIO(data))
+        return self._to_color_mode(image)
+    
+    def render_region(self, file_path: str, dpi: int, page: int,
+                      box: Tuple[float, float, float, float],
+                      cancel_token: Optional[CancellationToken] = None) -> Image.Image:
+        """Render a page region with pdftocairo's crop options (-x -y -W -H)"""
+        scale = dpi / 72
+        left, upper, right, lower = (round(value * scale) for value in box)
+        
+        data = self._run_pdftocairo([
+            '-png', '-singlefile',
+            '-r', str(dpi),
+            '-f', str(page), '-l', str(page),
+            '-x', str(left), '-y', str(upper),
+            '-W', str(right - left), '-H', str(lower - upper),
+            file_path, '-'
+        ], cancel_token)
+        
+        image = Image.open(io.BytesIO(data))
+        return self._to_color_mode(image)
+
+
+class PdfiumRenderer(Renderer):
+    """Render in-process through the pdfium bindings (optional pypdfium2 dependency)"""
+    
+    name = "pdfium"
+    
+    # pdfium is not thread-safe, serialize access within a process
+    _lock = threading.Lock()
+    
+    def __init__(self, color_mode: Optional[str] = None):
+        super().__init__(color_mode)
+        try:
+            import pypdfium2
+        except ImportError:
+            raise PDFLoadError("pypdfium2 is not installed (pip install pypdfium2)")
+        self._pdfium = pypdfium2
+    
+    def render(self, file_path: str, dpi: int, first_page: int = 1, last_page: int = 1,
+               thread_count: int = 1, cancel_token: Optional[CancellationToken] = None) -> List[Image.Image]:
+        """Render pages without spawning a subprocess (thread_count is ignored)"""
+        images = []
+        with self._lock:
+            document = self._pdfium.PdfDocument(file_path)
+            try:
+                last_page = min(last_page, len(document))
+                for page_index in range(first_page - 1, last_page):
+                    # In-process renders cannot be interrupted, stop between pages
+                    if cancel_token:
+                        cancel_token.raise_if_cancelled()
+                    page = document[page_index]
+                    try:
+                        bitmap = page.render(
+                            scale=dpi / 72,
+                            grayscale=self.color_mode != 'RGB',
+                            rev_byteorder=True
+                        )
+                        images.append(self._to_color_mode(bitmap.to_pil()))
+                    finally:
+                        page.close()
+            finally:
+                document.close()
+        return images
+    
+    def get_page_count(self, file_path: str) -> int:
+        """Get number of pages in document"""
+        with self._lock:
+            document = self._pdfium.PdfDocument(file_path)
+            try:
+                return len(document)
+            finally:
+                document.close()
+    
+    def get_page_size(self, file_path: str, page: int = 1) -> Tuple[float, float]:
+        """Get displayed page size in points"""
+        with self._lock:
+            document = self._pdfium.PdfDocument(file_path)
+            try:
+                pdf_page = document[page - 1]
+                try:
+                    return pdf_page.get_size()
+                finally:
+                    pdf_page.close()
+            finally:
+                document.close()
+    
+    def render_region(self, file_path: str, dpi: int, page: int,
+                      box: Tuple[float, float, float, float],
+                      cancel_token: Optional[CancellationToken] = None) -> Image.Image:
+        """Render a page region using pdfium's crop margins"""
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        left, upper, right, lower = box
+        with self._lock:
+            document = self._pdfium.PdfDocument(file_path)
+            try:
+                pdf_page = document[page - 1]
+                try:
+                    width, height = pdf_page.get_size()
+                    bitmap = pdf_page.render(
+                        scale=dpi / 72,
+                        crop=(left, height - lower, width - right, upper),
+                        grayscale=self.color_mode != 'RGB',
+                        rev_byteorder=True
+                    )
+                    return self._to_color_mode(bitmap.to_pil())
+                finally:
+                    pdf_page.close()
+            finally:
+                document.close()
+
+
+RENDERERS = {
+    PopplerRenderer.name: PopplerRenderer,
+    PdfiumRenderer.name: PdfiumRenderer
+}
+
+
+def get_renderer(name: Optional[str] = None, color_mode: Optional[str] = None) -> Renderer:
+    """Create renderer backend by name (defaults to the configured backend and color mode)"""
+    name = name or config.RENDERER_BACKEND
+    if name not in RENDERERS:
+        raise ValidationError(f"Unknown renderer backend: {name}")
+    return RENDERERS[name](color_mode)
\ No newline at end of file
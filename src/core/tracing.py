@@ -0,0 +1,130 @@
+"""
+Stage tracing for the processing pipeline
+
+Each stage runs inside a span that records wall time, CPU time (including
+pdftocairo child processes) and the pixel bytes it allocated. Spans are
+kept for the current run, pushed to listeners and optionally appended to a
+JSON lines log.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from PIL import Image
+
+from ..config import config
+from ..models import StageSpan
+from ..utils import get_image_nbytes
+
+# Stage name -> label shown in the status bar and batch report
+STAGE_LABELS = {
+    "cache": "cache",
+    "output_cache": "sorties en cache",
+    "render": "rendu",
+    "preview": "aperçu",
+    "detect": "détection",
+    "compose": "combinaison",
+    "encode": "encodage",
+    "vector_export": "export vectoriel",
+}
+
+
+def _cpu_time() -> float:
+    """CPU time of this process and of its finished children"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def summarize_spans(spans: Iterable[StageSpan]) -> Dict[str, StageSpan]:
+    """Merge spans of the same stage, keeping first-seen order"""
+    totals: Dict[str, StageSpan] = {}
+    for span in spans:
+        total = totals.setdefault(span.name, StageSpan(span.name, started_at=span.started_at))
+        total.wall_time += span.wall_time
+        total.cpu_time += span.cpu_time
+        total.pixel_bytes += span.pixel_bytes
+    return totals
+
+
+def format_stage_breakdown(stage_times: Dict[str, float]) -> str:
+    """Format stage wall times in seconds as a one-line breakdown"""
+    return " · ".join(
+        f"{STAGE_LABELS.get(name, name)} {seconds * 1000:.0f} ms"
+        for name, seconds in stage_times.items()
+    )
+
+
+class Tracer:
+    """Record stage spans for the current run"""
+    
+    def __init__(self, log_path: Optional[str] = None):
+        self.log_path = log_path or config.TRACE_LOG_PATH
+        self.spans: List[StageSpan] = []
+        self._listeners: List[Callable[[StageSpan], None]] = []
+        self._lock = threading.Lock()
+    
+    def add_listener(self, listener: Callable[[StageSpan], None]) -> None:
+        """Call listener with every finished span (from the thread that ran it)"""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[StageSpan], None]) -> None:
+        """Stop notifying listener"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    @contextmanager
+    def span(self, name: str) -> Iterator[StageSpan]:
+        """Time the enclosed block as one stage"""
+        span = StageSpan(name, started_at=time.time())
+        start_wall = time.perf_counter()
+        start_cpu = _cpu_time()
+        try:
+            yield span
+        finally:
+            # Concurrent spans share the process CPU clock, so their CPU times overlap
+            span.wall_time = time.perf_counter() - start_wall
+            span.cpu_time = _cpu_time() - start_cpu
+            self._record(span)
+    
+    def add_pixels(self, span: StageSpan, *images: Optional[Image.Image]) -> None:
+        """Account the pixel buffers of images allocated by a span"""
+        span.pixel_bytes += sum(get_image_nbytes(image) for image in images if image is not None)
+    
+    def _record(self, span: StageSpan) -> None:
+        """Store, log and publish a finished span"""
+        with self._lock:
+            self.spans.append(span)
+            if self.log_path:
+                try:
+                    with open(self.log_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(span.to_dict()) + "\n")
+                except OSError:
+                    pass  # Tracing must never break processing
+        
+        for listener in list(self._listeners):
+            try:
+                listener(span)
+            except Exception:
+                pass
+    
+    def reset(self) -> None:
+        """Forget the spans of the previous run"""
+        with self._lock:
+            self.spans = []
+    
+    def summary(self) -> Dict[str, StageSpan]:
+        """Get the spans of the current run merged per stage"""
+        with self._lock:
+            return summarize_spans(self.spans)
+    
+    def stage_times(self) -> Dict[str, float]:
+        """Get wall time per stage for the current run"""
+        return {name: span.wall_time for name, span in self.summary().items()}
+    
+    def format_breakdown(self) -> str:
+        """Get the per-stage breakdown of the current run"""
+        return format_stage_breakdown(self.stage_times())
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""
+Vector-preserving PDF export
+
+Builds the combined PDFs directly from the source pages: each half is the
+source page wrapped as a Form XObject, clipped to its region and placed
+with a single transformation matrix. Nothing is rasterized, so barcodes stay
+sharp and the output is as small as the sources. Requires the optional
+pikepdf dependency.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from ..exceptions import ExportError
+from ..models import PDFDocument
+from .layout import (
+    A4_SIZE_POINTS,
+    Box,
+    CompositionPlan,
+    SheetLayout,
+    SourceRegion,
+    impose,
+    plan_combination,
+    plan_page_region
+)
+
+Matrix = Tuple[float, float, float, float, float, float]
+
+
+def is_vector_export_available() -> bool:
+    """Check if the optional pikepdf dependency is installed"""
+    try:
+        import pikepdf  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _multiply(first: Matrix, second: Matrix) -> Matrix:
+    """Compose two PDF matrices (apply first, then second)"""
+    a1, b1, c1, d1, e1, f1 = first
+    a2, b2, c2, d2, e2, f2 = second
+    return (
+        a1 * a2 + b1 * c2,
+        a1 * b2 + b1 * d2,
+        c1 * a2 + d1 * c2,
+        c1 * b2 + d1 * d2,
+        e1 * a2 + f1 * c2 + e2,
+        e1 * b2 + f1 * d2 + f2
+    )
+
+
+def _page_to_display_matrix(bbox: Tuple[float, float, float, float], rotate: int) -> Matrix:
+    """Map PDF user space to displayed page coordinates (origin top-left, y down)"""
+    x0, y0, x1, y1 = bbox
+    rotate %= 360
+    if rotate == 90:
+        return (0, 1, 1, 0, -y0, -x0)
+    if rotate == 180:
+        return (-1, 0, 0, 1, x1, -y0)
+    if rotate == 270:
+        return (0, -1, -1, 0, y1, x1)
+    return (1, 0, 0, -1, -x0, y1)
+
+
+def _region_rotation_matrix(region: SourceRegion) -> Matrix:
+    """Rotate region-local coordinates counter-clockwise like Image.transpose"""
+    width, height = region.width, region.height
+    rotation = region.rotation % 360
+    if rotation == 90:
+        return (0, -1, 1, 0, 0, width)
+    if rotation == 180:
+        return (-1, 0, 0, -1, width, height)
+    if rotation == 270:
+        return (0, 1, -1, 0, height, 0)
+    return (1, 0, 0, 1, 0, 0)
+
+
+class _VectorSource:
+    """Source page of one input, wrapped as a Form XObject"""
+    
+    def __init__(self, pdf, document: PDFDocument):
+        self.document = document
+        self.page = pdf.pages[document.page_number - 1]
+        self.form = self.page.as_form_xobject(handle_transformations=False)
+        self.bbox = tuple(float(value) for value in self.form.BBox)
+        self.rotate = int(self._get_inherited('/Rotate', 0))
+        
+        width = self.bbox[2] - self.bbox[0]
+        height = self.bbox[3] - self.bbox[1]
+        self.display_size = (height, width) if self.rotate % 180 else (width, height)
+    
+    def _get_inherited(self, key: str, default):
+        """Get a page attribute, following the page tree for inherited values"""
+        node = self.page.obj
+        while node is not None:
+            if key in node:
+                return node[key]
+            node = node.get('/Parent')
+        return default
+
+
+class VectorPDFExporter:
+    """Compose the combined PDFs from the source pages without rasterizing"""
+    
+    def __init__(self):
+        try:
+            import pikepdf
+        except ImportError:
+            raise ExportError("pikepdf is not installed (pip install pikepdf)")
+        self._pikepdf = pikepdf
+    
+    def _open_sources(self, documents: Sequence[PDFDocument],
+                      opened: list) -> List[Optional[_VectorSource]]:
+        """Wrap the page of each document (None for blank pages), recording opened files"""
+        sources = []
+        for document in documents:
+            if document.is_blank:
+                sources.append(None)
+                continue
+            source_pdf = self._pikepdf.open(document.file_path)
+            opened.append(source_pdf)
+            sources.append(_VectorSource(source_pdf, document))
+        return sources
+    
+    def export(self, pdf1: PDFDocument, pdf2: PDFDocument, top_path: str, bottom_path: str,
+               label_boxes: Sequence[Optional[Tuple[Box, Box]]] = (None, None)) -> None:
+        """Write the tops and bottoms PDFs (label_boxes as in plan_combination)"""
+        opened = []
+        try:
+            sources = self._open_sources((pdf1, pdf2), opened)
+            
+            # Blank pages take the size of the other input, like the raster path
+            sizes = [source.display_size if source else None for source in sources]
+            for index, size in enumerate(sizes):
+                if size is None:
+                    sizes[index] = sizes[1 - index] or A4_SIZE_POINTS
+            
+            top_plan, bottom_plan = plan_combination(
+                sizes[0], pdf1.orientation, sizes[1], pdf2.orientation, label_boxes
+            )
+            
+            self._write_combined(sources, top_plan, top_path)
+            self._write_combined(sources, bottom_plan, bottom_path)
+        except ExportError:
+            raise
+        except Exception as e:
+            raise ExportError(f"Failed to export vector PDF: {str(e)}")
+        finally:
+            for source_pdf in opened:
+                source_pdf.close()
+    
+    def export_sheets(self, documents: Sequence[PDFDocument], layout: SheetLayout,
+                      file_paths: Sequence[str]) -> None:
+        """Impose whole pages on the layout's sheets, one PDF per sheet"""
+        opened = []
+        try:
+            sources = self._open_sources(documents, opened)
+            regions = [
+                (index, plan_page_region(*(source.display_size if source else A4_SIZE_POINTS),
+                                         document.orientation))
+                for index, (source, document) in enumerate(zip(sources, documents))
+            ]
+            
+            for plan, file_path in zip(impose(layout, regions), file_paths):
+                self._write_combined(sources, plan, file_path)
+        except ExportError:
+            raise
+        except Exception as e:
+            raise ExportError(f"Failed to export vector PDF: {str(e)}")
+        finally:
+            for source_pdf in opened:
+                source_pdf.close()
+    
+    def _write_combined(self, sources: List[Optional[_VectorSource]],
+                        plan: CompositionPlan, file_path: str) -> None:
+        """Place each planned region on one page, following the same plan as the raster path"""
+        pikepdf = self._pikepdf
+        page_width, page_height = plan.size
+        
+        output = pikepdf.new()
+        output.add_blank_page(page_size=(page_width, page_height))
+        page = output.pages[0]
+        
+        content = []
+        for placement in plan.placements:
+            source = sources[placement.source]
+            if source is None:
+                continue
+            
+            region = placement.region
+            out_width, out_height = region.output_size
+            x, y = placement.position
+            width, height = placement.size
+            
+            form = output.copy_foreign(source.form)
+            name = page.add_resource(form, pikepdf.Name.XObject, prefix='Fx')
+            
+            # Source page -> displayed page -> region -> rotated region -> output page
+            matrix = _page_to_display_matrix(source.bbox, source.rotate)
+            matrix = _multiply(matrix, (1, 0, 0, 1, -region.box[0], -region.box[1]))
+            matrix = _multiply(matrix, _region_rotation_matrix(region))
+            matrix = _multiply(matrix, (width / out_width, 0, 0, height / out_height, x, y))
+            matrix = _multiply(matrix, (1, 0, 0, -1, 0, page_height))
+            
+            clip_bottom = page_height - y - height
+            content.append(
+                f"q {x:.4f} {clip_bottom:.4f} {width:.4f} {height:.4f} re W n "
+                f"{' '.join(f'{value:.6f}' for value in matrix)} cm {name} Do Q"
+            )
+        
+        page.obj.Contents = output.make_stream("\n".join(content).encode('ascii'))
+        output.save(file_path, compress_streams=True)
\ No newline at end of file
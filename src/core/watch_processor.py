@@ -0,0 +1,326 @@
+"""
+Watch folder mode: combine label PDFs as carriers drop them in an inbox
+"""
+
+import os
+import re
+import shutil
+import signal
+import threading
+import time
+from dataclasses import replace
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from ..models import BatchJob, BatchReport, ExportConfig, JobResult, Orientation
+from ..config import config
+from ..exceptions import ValidationError
+from ..utils import ensure_directory_exists, get_unique_filename
+from .batch_processor import make_batch_job, run_batch_job
+
+
+def is_inotify_available() -> bool:
+    """Check if the optional watchdog dependency is installed"""
+    try:
+        import watchdog  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _ignore_interrupt() -> None:
+    """Let the watcher handle Ctrl+C: workers finish their job instead of dying mid-file"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class StableFileDetector:
+    """Report the PDFs of a folder once they are fully written
+    
+    A file is complete when its size and modification time did not change
+    over stable_checks consecutive scans spanning at least stable_time
+    seconds (scans can follow each other quickly when inotify wakes them),
+    or as soon as its writer closed it (reported by inotify through
+    mark_closed).
+    """
+    
+    def __init__(self, directory: str, stable_checks: Optional[int] = None,
+                 stable_time: Optional[float] = None):
+        self.directory = directory
+        self.stable_checks = stable_checks or config.WATCH_STABLE_CHECKS
+        self.stable_time = self.stable_checks * config.WATCH_POLL_INTERVAL if stable_time is None else stable_time
+        # Path -> (size and mtime, unchanged scans, time the signature was first seen)
+        self._seen: Dict[str, Tuple[Tuple[int, int], int, float]] = {}
+        self._closed: Set[str] = set()
+        self._reported: Set[str] = set()
+        self._lock = threading.Lock()
+    
+    def mark_closed(self, path: str) -> None:
+        """Record that a writer closed a file"""
+        with self._lock:
+            self._closed.add(os.path.abspath(path))
+    
+    def scan(self, now: Optional[float] = None) -> List[str]:
+        """Get the files completed since the last scan, oldest first"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            closed, self._closed = self._closed, set()
+        
+        seen = {}
+        ready = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.lower().endswith('.pdf'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Moved away meanwhile
+                
+                path = os.path.abspath(entry.path)
+                signature = (stat.st_size, stat.st_mtime_ns)
+                previous = self._seen.get(path)
+                if previous and previous[0] == signature:
+                    unchanged, since = previous[1] + 1, previous[2]
+                else:
+                    unchanged, since = 0, now
+                seen[path] = (signature, unchanged, since)
+                
+                stable = unchanged >= self.stable_checks and now - since >= self.stable_time
+                complete = stable or path in closed
+                if stat.st_size and complete and path not in self._reported:
+                    ready.append((stat.st_mtime_ns, path))
+        
+        # Forget files that left the folder, so a new file with the same name is picked up
+        self._seen = seen
+        self._reported = {path for path in self._reported if path in seen}
+        self._reported.update(path for _, path in ready)
+        return [path for _, path in sorted(ready)]
+
+
+class FilePairer:
+    """Group completed files into pairs, by arrival or by a filename rule
+    
+    With a pattern, files whose names give the same key are paired, in name
+    order. The key is the pattern's "key" group, or the whole match, e.g.
+    r"(?P<key>.+)_[12]\\.pdf" pairs "colis_1.pdf" with "colis_2.pdf". Files
+    not matching the pattern are paired by arrival.
+    """
+    
+    def __init__(self, pattern: Optional[str] = None, timeout: Optional[float] = None):
+        try:
+            self.pattern = re.compile(pattern) if pattern else None
+        except re.error as e:
+            raise ValidationError(f"Invalid pairing pattern: {str(e)}")
+        self.timeout = config.WATCH_PAIR_TIMEOUT if timeout is None else timeout
+        self._waiting: Dict[Optional[str], List[Tuple[str, float]]] = {}
+    
+    def _get_key(self, path: str) -> Optional[str]:
+        """Get the pairing key of a file, None for arrival order"""
+        if not self.pattern:
+            return None
+        match = self.pattern.search(os.path.basename(path))
+        if not match:
+            return None
+        return match.groupdict().get('key') or match.group(0)
+    
+    def add(self, path: str, now: Optional[float] = None) -> None:
+        """Queue a completed file"""
+        arrival = time.monotonic() if now is None else now
+        self._waiting.setdefault(self._get_key(path), []).append((path, arrival))
+    
+    def pop_pairs(self, now: Optional[float] = None) -> List[Tuple[str, Optional[str]]]:
+        """Take the complete pairs, and lone files older than the timeout with a blank page"""
+        now = time.monotonic() if now is None else now
+        pairs = []
+        for key in list(self._waiting):
+            files = self._waiting[key]
+            if key is not None:
+                files.sort()
+            
+            while len(files) >= 2:
+                pairs.append((files.pop(0)[0], files.pop(0)[0]))
+            
+            if files and self.timeout and now - files[0][1] >= self.timeout:
+                pairs.append((files.pop(0)[0], None))
+            
+            if not files:
+                del self._waiting[key]
+        return pairs
+    
+    @property
+    def pending(self) -> int:
+        """Get the number of files waiting for their pair"""
+        return sum(len(files) for files in self._waiting.values())
+
+
+class FolderWatcher:
+    """Combine pairs of PDFs dropped in an inbox and write the results to an outbox
+    
+    Pairs go through a bounded queue to a pool of worker processes: when
+    workers + queue_size pairs are in flight, scanning pauses and new files
+    simply wait on disk. Processed inputs are moved to the WATCH_DONE_DIR or
+    WATCH_FAILED_DIR subfolder of the inbox.
+    """
+    
+    def __init__(self, inbox: str, outbox: str, export_config: Optional[ExportConfig] = None,
+                 workers: Optional[int] = None, pair_pattern: Optional[str] = None,
+                 orientation1: Orientation = Orientation.PORTRAIT,
+                 orientation2: Orientation = Orientation.PORTRAIT,
+                 trace_log: Optional[str] = None, queue_size: Optional[int] = None,
+                 poll_interval: Optional[float] = None):
+        if not os.path.isdir(inbox):
+            raise ValidationError(f"Watched folder not found: {inbox}")
+        
+        self.inbox = inbox
+        self.outbox = outbox
+        self.export_config = export_config or ExportConfig()
+        self.workers = workers or config.BATCH_WORKERS or os.cpu_count() or 1
+        self.orientation1 = orientation1
+        self.orientation2 = orientation2
+        self.trace_log = trace_log or config.TRACE_LOG_PATH
+        self.queue_size = config.WATCH_QUEUE_SIZE if queue_size is None else queue_size
+        self.poll_interval = poll_interval or config.WATCH_POLL_INTERVAL
+        
+        self.detector = StableFileDetector(inbox, stable_time=config.WATCH_STABLE_CHECKS * self.poll_interval)
+        self.pairer = FilePairer(pair_pattern)
+        self.report = BatchReport(workers=self.workers)
+        
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._next_job_id = 1
+        self._pending_outputs: Set[str] = set()  # Output filenames of the queued jobs
+    
+    def stop(self) -> None:
+        """Stop watching; jobs already submitted still complete"""
+        self._stop.set()
+        self._wake.set()
+    
+    def _start_observer(self):
+        """Wake the scan loop on inotify events when watchdog is installed"""
+        if not is_inotify_available():
+            return None
+        
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+        
+        watcher = self
+        
+        class InboxHandler(FileSystemEventHandler):
+            def on_closed(self, event):
+                if not event.is_directory:
+                    watcher.detector.mark_closed(event.src_path)
+                watcher._wake.set()
+            
+            def on_any_event(self, event):
+                watcher._wake.set()
+        
+        observer = Observer()
+        observer.schedule(InboxHandler(), self.inbox, recursive=False)
+        observer.start()
+        return observer
+    
+    def _archive_inputs(self, job: BatchJob, success: bool) -> None:
+        """Move the inputs of a finished job out of the inbox"""
+        target = os.path.join(self.inbox, config.WATCH_DONE_DIR if success else config.WATCH_FAILED_DIR)
+        for path in (job.pdf1_path, job.pdf2_path):
+            if path and os.path.exists(path):
+                filename = get_unique_filename(target, os.path.basename(path))
+                shutil.move(path, os.path.join(target, filename))
+    
+    def _get_output_filenames(self, job: BatchJob) -> Tuple[str, str]:
+        """Get the tops and bottoms filenames a job writes in the outbox"""
+        job_config = replace(self.export_config, top_filename=job.top_filename, bottom_filename=job.bottom_filename)
+        return job_config.get_full_filename(is_top=True), job_config.get_full_filename(is_top=False)
+    
+    def _make_unique_job(self, pdf1_path: str, pdf2_path: Optional[str]) -> BatchJob:
+        """Create the next job, numbering its outputs when a previous pair used the same names"""
+        job = make_batch_job(self._next_job_id, pdf1_path, pdf2_path, self.orientation1, self.orientation2)
+        self._next_job_id += 1
+        
+        unique_job = job
+        counter = 0
+        while True:
+            filenames = self._get_output_filenames(unique_job)
+            with self._lock:
+                taken = any(
+                    filename in self._pending_outputs or os.path.exists(os.path.join(self.outbox, filename))
+                    for filename in filenames
+                )
+                if not taken:
+                    self._pending_outputs.update(filenames)
+                    return unique_job
+            
+            # Same scheme as get_unique_filename, e.g. "a_b_hauts_1.pdf"
+            counter += 1
+            unique_job = replace(
+                job,
+                top_filename=f"{job.top_filename}_{counter}",
+                bottom_filename=f"{job.bottom_filename}_{counter}"
+            )
+    
+    def _finish_job(self, job: BatchJob, future: Future,
+                    on_job_done: Optional[Callable[[BatchJob, JobResult], None]]) -> None:
+        """Record a finished job and free its queue slot"""
+        try:
+            result = future.result()
+        except BaseException as e:
+            # Also KeyboardInterrupt from a worker, the slot must still be released
+            result = JobResult(job_id=job.job_id, success=False, error=str(e) or type(e).__name__)
+        
+        try:
+            self._archive_inputs(job, result.success)
+        except OSError as e:
+            result.success = False
+            result.error = f"{result.error or ''} Failed to move inputs: {str(e)}".strip()
+        
+        with self._lock:
+            self.report.results.append(result)
+            self._pending_outputs.difference_update(self._get_output_filenames(job))
+        self._slots.release()
+        
+        if on_job_done:
+            on_job_done(job, result)
+    
+    def _submit(self, executor: ProcessPoolExecutor, pdf1_path: str, pdf2_path: Optional[str],
+                on_job_done: Optional[Callable[[BatchJob, JobResult], None]]) -> bool:
+        """Queue a pair, blocking while the queue is full (False if stopped meanwhile)"""
+        while not self._slots.acquire(timeout=self.poll_interval):
+            if self._stop.is_set():
+                return False
+        
+        job = self._make_unique_job(pdf1_path, pdf2_path)
+        future = executor.submit(run_batch_job, job, self.outbox, self.export_config, self.trace_log)
+        future.add_done_callback(lambda done: self._finish_job(job, done, on_job_done))
+        return True
+    
+    def run(self, on_job_done: Optional[Callable[[BatchJob, JobResult], None]] = None) -> BatchReport:
+        """Watch the inbox until stop() is called, then wait for the running jobs"""
+        for directory in (self.outbox,
+                          os.path.join(self.inbox, config.WATCH_DONE_DIR),
+                          os.path.join(self.inbox, config.WATCH_FAILED_DIR)):
+            ensure_directory_exists(directory)
+        
+        start = time.perf_counter()
+        observer = self._start_observer()
+        try:
+            # Rendering and pixel work are CPU-bound, so use processes rather than threads
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_ignore_interrupt) as executor:
+                while not self._stop.is_set():
+                    for path in self.detector.scan():
+                        self.pairer.add(path)
+                    
+                    for pdf1_path, pdf2_path in self.pairer.pop_pairs():
+                        if not self._submit(executor, pdf1_path, pdf2_path, on_job_done):
+                            break
+                    
+                    self._wake.wait(self.poll_interval)
+                    self._wake.clear()
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
+            self.report.wall_time = time.perf_counter() - start
+        
+        return self.report
\ No newline at end of file
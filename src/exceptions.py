@@ -35,4 +35,9 @@ class FileNotFoundError(PDFCombinerError):
 
 class UnsupportedFormatError(PDFCombinerError):
     """Exception raised when format is not supported"""
-    pass 
\ No newline at end of file
+    pass
+
+
+class OperationCancelledError(PDFCombinerError):
+    """Exception raised when an operation is cancelled"""
+    pass
\ No newline at end of file
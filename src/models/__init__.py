@@ -2,6 +2,12 @@
 Models module for PDF Combiner application
 """
 
-from .document import PDFDocument, CombinedDocument, ExportConfig, Orientation
+from .document import PDFDocument, CombinedDocument, ExportConfig, ExportSnapshot, Orientation, SolidFill, PageSource
+from .batch import BatchJob, DocumentJob, SheetJob, JobResult, BatchReport
+from .trace import StageSpan
 
-__all__ = ['PDFDocument', 'CombinedDocument', 'ExportConfig', 'Orientation'] 
\ No newline at end of file
+__all__ = [
+    'PDFDocument', 'CombinedDocument', 'ExportConfig', 'ExportSnapshot', 'Orientation', 'SolidFill', 'PageSource',
+    'BatchJob', 'DocumentJob', 'SheetJob', 'JobResult', 'BatchReport',
+    'StageSpan'
+] 
\ No newline at end of file
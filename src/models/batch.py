@@ -0,0 +1,119 @@
+"""
+Batch processing models
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .document import Orientation
+
+
+@dataclass
+class BatchJob:
+    """A pair of inputs to combine in headless batch mode"""
+    job_id: int
+    pdf1_path: Optional[str] = None  # None means blank page
+    pdf2_path: Optional[str] = None  # None means blank page
+    orientation1: Orientation = Orientation.PORTRAIT
+    orientation2: Orientation = Orientation.PORTRAIT
+    top_filename: str = "tops_combined"
+    bottom_filename: str = "bottoms_combined"
+    
+    @property
+    def label(self) -> str:
+        """Get a human readable label for the job"""
+        name1 = self.pdf1_path or "blank"
+        name2 = self.pdf2_path or "blank"
+        return f"#{self.job_id} {name1} + {name2}"
+
+
+@dataclass
+class DocumentJob:
+    """A multi-page document whose consecutive pages are combined in pairs"""
+    job_id: int
+    file_path: str
+    orientation1: Orientation = Orientation.PORTRAIT
+    orientation2: Orientation = Orientation.PORTRAIT
+    base_filename: str = "combined"
+    
+    @property
+    def label(self) -> str:
+        """Get a human readable label for the job"""
+        return f"#{self.job_id} {self.file_path}"
+
+
+@dataclass
+class SheetJob:
+    """Single page PDFs imposed together on one sheet, one page per cell"""
+    job_id: int
+    pdf_paths: Tuple[str, ...]
+    layout: str = "a6-4up"  # Name of a layout preset
+    orientation: Orientation = Orientation.PORTRAIT
+    filename: str = "planche"
+    
+    @property
+    def label(self) -> str:
+        """Get a human readable label for the job"""
+        return f"#{self.job_id} {' + '.join(self.pdf_paths)}"
+
+
+@dataclass
+class JobResult:
+    """Result of a single batch job (one combined pair)"""
+    job_id: int
+    success: bool
+    pages: Optional[Tuple[int, Optional[int]]] = None  # Page pair for document jobs
+    latency: float = 0.0
+    top_path: Optional[str] = None
+    bottom_path: Optional[str] = None
+    error: Optional[str] = None
+    stages: Dict[str, float] = field(default_factory=dict)  # Wall time per stage in seconds
+
+
+@dataclass
+class BatchReport:
+    """Aggregated result of a batch run"""
+    results: List[JobResult] = field(default_factory=list)
+    wall_time: float = 0.0
+    workers: int = 1
+    
+    @property
+    def succeeded(self) -> List[JobResult]:
+        """Get successful job results"""
+        return [result for result in self.results if result.success]
+    
+    @property
+    def failed(self) -> List[JobResult]:
+        """Get failed job results"""
+        return [result for result in self.results if not result.success]
+    
+    @property
+    def jobs_per_second(self) -> float:
+        """Get throughput of the batch run"""
+        if self.wall_time <= 0:
+            return 0.0
+        return len(self.results) / self.wall_time
+    
+    def latency_percentile(self, percentile: float) -> float:
+        """Get per-job latency percentile (nearest rank) in seconds"""
+        latencies = sorted(result.latency for result in self.results)
+        if not latencies:
+            return 0.0
+        rank = max(1, round(percentile / 100 * len(latencies)))
+        return latencies[min(rank, len(latencies)) - 1]
+    
+    @property
+    def mean_latency(self) -> float:
+        """Get mean per-job latency in seconds"""
+        if not self.results:
+            return 0.0
+        return sum(result.latency for result in self.results) / len(self.results)
+    
+    def mean_stage_times(self) -> Dict[str, float]:
+        """Get mean wall time per stage over successful jobs, in seconds"""
+        succeeded = self.succeeded
+        totals: Dict[str, float] = {}
+        for result in succeeded:
+            for name, seconds in result.stages.items():
+                totals[name] = totals.get(name, 0.0) + seconds
+        return {name: seconds / len(succeeded) for name, seconds in totals.items()}
\ No newline at end of file
@@ -3,7 +3,7 @@ Document models for PDF operations
 """
 
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 from PIL import Image
 from enum import Enum
 
@@ -12,16 +12,43 @@ class Orientation(Enum):
     """Document orientation enum"""
     PORTRAIT = "Portrait"
     LANDSCAPE = "Paysage"
+    AUTO = "Auto"  # Detected from the page, see PDFProcessor.get_orientation
+
+
+@dataclass(frozen=True)
+class SolidFill:
+    """Uniform page known only by its size and colour, its pixels are never allocated"""
+    size: Tuple[int, int]
+    mode: str = 'RGB'
+    color: str = 'white'
+    
+    @property
+    def width(self) -> int:
+        return self.size[0]
+    
+    @property
+    def height(self) -> int:
+        return self.size[1]
+    
+    def to_image(self) -> Image.Image:
+        """Allocate the page, for code that needs real pixels"""
+        return Image.new(self.mode, self.size, self.color)
+
+
+# A rendered page, or a lazy fill for blank pages
+PageSource = Union[Image.Image, SolidFill]
 
 
 @dataclass
 class PDFDocument:
     """Model representing a PDF document with its properties"""
     file_path: Optional[str] = None
+    page_number: int = 1
     is_blank: bool = False
     orientation: Orientation = Orientation.PORTRAIT
     preview_image: Optional[Image.Image] = None
-    hires_image: Optional[Image.Image] = None
+    hires_image: Optional[PageSource] = None
+    hires_box: Optional[Tuple[float, float, float, float]] = None  # Page fractions rendered, None for the whole page
     
     @property
     def is_loaded(self) -> bool:
@@ -43,6 +70,8 @@ class CombinedDocument:
     """Model representing the combined document result"""
     top_combined: Optional[Image.Image] = None
     bottom_combined: Optional[Image.Image] = None
+    top_preview: Optional[Image.Image] = None  # Thumbnails made by the worker for the UI
+    bottom_preview: Optional[Image.Image] = None
     export_format: str = "PDF"
     
     @property
@@ -55,6 +84,27 @@ class CombinedDocument:
         return self.export_format.lower()
 
 
+@dataclass(frozen=True)
+class ExportSnapshot:
+    """What an export reads from the processor, captured before it starts
+    
+    The export can then run in the background while the pair is changed.
+    """
+    vector_export: bool
+    top_combined: Optional[Image.Image] = None
+    bottom_combined: Optional[Image.Image] = None
+    documents: Optional[Tuple["PDFDocument", "PDFDocument"]] = None  # Vector export, orientations resolved
+    label_boxes: Tuple[Optional[tuple], Optional[tuple]] = (None, None)
+    output_key: Optional[str] = None
+
+
+# Formats whose file extension differs from their name
+FORMAT_EXTENSIONS = {
+    "PDF-G4": "pdf",
+    "TIFF-G4": "tif",
+}
+
+
 @dataclass
 class ExportConfig:
     """Configuration for document export"""
@@ -67,7 +117,7 @@ class ExportConfig:
     def get_full_filename(self, is_top: bool) -> str:
         """Get full filename with extension"""
         base_name = self.top_filename if is_top else self.bottom_filename
-        extension = self.format_type.lower()
+        extension = FORMAT_EXTENSIONS.get(self.format_type.upper(), self.format_type.lower())
         if not base_name.endswith(f'.{extension}'):
             base_name += f'.{extension}'
         return base_name 
\ No newline at end of file
@@ -0,0 +1,19 @@
+"""
+Tracing models
+"""
+
+from dataclasses import dataclass, asdict
+
+
+@dataclass
+class StageSpan:
+    """Timing and memory footprint of one processing stage"""
+    name: str
+    wall_time: float = 0.0  # Seconds
+    cpu_time: float = 0.0  # Seconds, including child processes (pdftocairo)
+    pixel_bytes: int = 0  # Bytes of pixel data allocated by the stage
+    started_at: float = 0.0  # Unix timestamp
+    
+    def to_dict(self) -> dict:
+        """Get a JSON serializable representation"""
+        return asdict(self)
\ No newline at end of file
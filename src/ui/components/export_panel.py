@@ -186,6 +186,13 @@ class ExportPanel(ctk.CTkFrame):
         else:
             self.export_button.configure(text="Traitement requis")
     
+    def set_exporting_state(self, exporting: bool) -> None:
+        """Disable the export button while files are being written"""
+        if exporting:
+            self.export_button.configure(state="disabled", text="Export en cours...")
+        else:
+            self.export_button.configure(state="normal", text="Exporter les fichiers")
+    
     def update_filename_suggestions(self, pdf1_name: str = None, pdf2_name: str = None) -> None:
         """Update filename suggestions based on loaded PDFs"""
         if pdf1_name and pdf2_name:
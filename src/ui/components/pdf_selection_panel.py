@@ -123,7 +123,7 @@ class PDFSelectionPanel(ctk.CTkFrame):
         orientation_label.pack(side="left", padx=(0, 10))
         
         # Orientation variable
-        orientation_var = ctk.StringVar(value="Portrait")
+        orientation_var = ctk.StringVar(value="Auto")
         if pdf_number == 1:
             self.pdf1_orientation = orientation_var
         else:
@@ -131,7 +131,7 @@ class PDFSelectionPanel(ctk.CTkFrame):
         
         orientation_menu = ctk.CTkOptionMenu(
             orientation_frame,
-            values=["Portrait", "Paysage"],
+            values=["Auto", "Portrait", "Paysage"],
             variable=orientation_var,
             width=100,
             height=28,
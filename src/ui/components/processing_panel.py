@@ -6,8 +6,7 @@ import customtkinter as ctk
 from typing import Optional, Callable, Tuple
 from PIL import Image
 
-from ...config import config
-from ...utils import convert_pil_to_ctk_image, resize_image_for_preview
+from ...utils import convert_pil_to_ctk_image
 
 
 class ProcessingPanel(ctk.CTkFrame):
@@ -152,13 +151,11 @@ class ProcessingPanel(ctk.CTkFrame):
     
     def update_combined_previews(self, top_image: Optional[Image.Image], 
                                bottom_image: Optional[Image.Image]) -> None:
-        """Update combined preview images"""
+        """Update combined preview images (already preview sized)"""
         # Update top combined preview
         if top_image:
             try:
-                # Resize for preview
-                preview_image = resize_image_for_preview(top_image, config.PREVIEW_MAX_SIZE)
-                ctk_image = convert_pil_to_ctk_image(preview_image)
+                ctk_image = convert_pil_to_ctk_image(top_image)
                 self.combined1_preview.configure(image=ctk_image, text="")
             except Exception:
                 self.combined1_preview.configure(
@@ -174,9 +171,7 @@ class ProcessingPanel(ctk.CTkFrame):
         # Update bottom combined preview
         if bottom_image:
             try:
-                # Resize for preview
-                preview_image = resize_image_for_preview(bottom_image, config.PREVIEW_MAX_SIZE)
-                ctk_image = convert_pil_to_ctk_image(preview_image)
+                ctk_image = convert_pil_to_ctk_image(bottom_image)
                 self.combined2_preview.configure(image=ctk_image, text="")
             except Exception:
                 self.combined2_preview.configure(
@@ -124,6 +124,8 @@ class SuccessDialog:
         # Format specific info
         if self.format_type == "PDF":
             format_info = "Format: PDF vectoriel\\nDimensions originales préservées"
+        elif self.format_type.endswith("-G4"):
+            format_info = "Format: noir et blanc (CCITT G4)\\nFichiers légers, codes-barres nets"
         else:
             format_info = "Format: PNG haute résolution\\nDimensions: Qualité professionnelle"
         
@@ -188,6 +188,10 @@ class MainWindow:
         """Enable/disable export functionality"""
         self.export_panel.enable_export(enabled)
     
+    def set_exporting_state(self, exporting: bool) -> None:
+        """Set exporting state"""
+        self.export_panel.set_exporting_state(exporting)
+    
     def show_success_dialog(self, format_type: str, top_filename: str, 
                           bottom_filename: str, save_directory: str) -> None:
         """Show success dialog"""
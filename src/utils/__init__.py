@@ -5,8 +5,14 @@ Utilities module for PDF Combiner application
 from .file_utils import (
     validate_file_exists,
     validate_pdf_file,
+    collect_pdf_files,
     get_file_size,
     get_filename_without_extension,
+    compute_file_hash,
+    get_file_hash,
+    get_temp_path,
+    atomic_write,
+    get_user_cache_dir,
     ensure_directory_exists,
     open_file_explorer,
     sanitize_filename,
@@ -15,12 +21,18 @@ from .file_utils import (
 
 from .image_utils import (
     create_blank_image,
+    get_preview_size,
     resize_image_for_preview,
+    downscale_image,
     convert_pil_to_ctk_image,
     apply_orientation_transform,
     crop_image_half,
+    extract_region,
+    transform_region,
     combine_images_vertically,
+    convert_to_bilevel,
     save_image_with_format,
+    get_image_nbytes,
     get_image_info
 )
 
@@ -28,8 +40,14 @@ __all__ = [
     # File utilities
     'validate_file_exists',
     'validate_pdf_file',
+    'collect_pdf_files',
     'get_file_size',
     'get_filename_without_extension',
+    'compute_file_hash',
+    'get_file_hash',
+    'get_temp_path',
+    'atomic_write',
+    'get_user_cache_dir',
     'ensure_directory_exists',
     'open_file_explorer',
     'sanitize_filename',
@@ -37,11 +55,17 @@ __all__ = [
     
     # Image utilities
     'create_blank_image',
+    'get_preview_size',
     'resize_image_for_preview',
+    'downscale_image',
     'convert_pil_to_ctk_image',
     'apply_orientation_transform',
     'crop_image_half',
+    'extract_region',
+    'transform_region',
     'combine_images_vertically',
+    'convert_to_bilevel',
     'save_image_with_format',
+    'get_image_nbytes',
     'get_image_info'
 ] 
\ No newline at end of file
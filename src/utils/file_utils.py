@@ -3,9 +3,13 @@ File utilities for PDF Combiner application
 """
 
 import os
+import hashlib
 import subprocess
 import platform
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import IO, Iterable, Iterator, List, Optional
 from ..exceptions import FileNotFoundError
 
 
@@ -21,6 +25,23 @@ def validate_pdf_file(file_path: str) -> bool:
     return file_path.lower().endswith('.pdf')
 
 
+def collect_pdf_files(paths: Iterable[str]) -> List[str]:
+    """Expand files and directories into an ordered list of PDF files"""
+    pdf_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            # Directory contents are taken in name order
+            for name in sorted(os.listdir(path)):
+                file_path = os.path.join(path, name)
+                if validate_pdf_file(file_path):
+                    pdf_files.append(file_path)
+        elif validate_pdf_file(path):
+            pdf_files.append(path)
+        else:
+            raise FileNotFoundError(f"PDF file not found: {path}")
+    return pdf_files
+
+
 def get_file_size(file_path: str) -> Optional[int]:
     """Get file size in bytes"""
     try:
@@ -34,6 +55,63 @@ def get_filename_without_extension(file_path: str) -> str:
     return os.path.splitext(os.path.basename(file_path))[0]
 
 
+def compute_file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Compute SHA-256 hex digest of file content"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def _hash_file_version(file_path: str, size: int, mtime_ns: int) -> str:
+    """Hash one version of a file, identified by its size and modification time"""
+    return compute_file_hash(file_path)
+
+
+def get_file_hash(file_path: str) -> str:
+    """Get content hash of file (memoized while the file is unchanged)"""
+    stat = os.stat(file_path)
+    return _hash_file_version(os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+
+def get_temp_path(file_path: str) -> str:
+    """Get a temporary path next to file_path, unique to this process and thread"""
+    return f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+@contextmanager
+def atomic_write(file_path: str, mode: str = 'wb', **kwargs) -> Iterator[IO]:
+    """Write a file through a temporary one, published only once complete
+    
+    Concurrent readers, e.g. other worker processes, never see a partial file.
+    """
+    temp_path = get_temp_path(file_path)
+    try:
+        with open(temp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def get_user_cache_dir(app_name: str) -> str:
+    """Get per-user cache directory for the application"""
+    system = platform.system()
+    if system == "Windows":
+        base_dir = os.environ.get('LOCALAPPDATA') or os.path.expanduser(os.path.join('~', 'AppData', 'Local'))
+    elif system == "Darwin":  # macOS
+        base_dir = os.path.expanduser(os.path.join('~', 'Library', 'Caches'))
+    else:  # Linux
+        base_dir = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache'))
+    return os.path.join(base_dir, app_name)
+
+
 def ensure_directory_exists(directory_path: str) -> None:
     """Ensure directory exists, create if not"""
     if not os.path.exists(directory_path):
@@ -3,44 +3,75 @@ Image utilities for PDF Combiner application
 """
 
 import customtkinter as ctk
-from PIL import Image, ImageTk
+from PIL import Image, ImageTk, TiffImagePlugin, features
 from typing import Optional, Tuple
 from ..config import config
 from ..exceptions import ImageProcessingError
 
 
-def create_blank_image(width: int, height: int) -> Image.Image:
+def create_blank_image(width: int, height: int, mode: str = 'RGB') -> Image.Image:
     """Create a blank white image with specified dimensions"""
     try:
-        return Image.new('RGB', (width, height), 'white')
+        return Image.new(mode, (width, height), 'white')
     except Exception as e:
         raise ImageProcessingError(f"Failed to create blank image: {str(e)}")
 
 
-def resize_image_for_preview(image: Image.Image, max_size: Tuple[int, int]) -> Image.Image:
-    """Resize image to fit within max_size while maintaining aspect ratio"""
+def get_preview_size(size: Tuple[int, int], max_size: Tuple[int, int]) -> Tuple[int, int]:
+    """Get the size fitting within max_size while maintaining aspect ratio"""
+    width, height = size
+    aspect_ratio = width / height
+    max_width, max_height = max_size
+    
+    # Calculate new dimensions
+    if aspect_ratio > 1:  # Landscape
+        new_width = min(max_width, width)
+        new_height = int(new_width / aspect_ratio)
+    else:  # Portrait
+        new_height = min(max_height, height)
+        new_width = int(new_height * aspect_ratio)
+    
+    # Ensure minimum dimensions
+    return max(1, new_width), max(1, new_height)
+
+
+def resize_image_for_preview(image: Image.Image, max_size: Tuple[int, int], fast: bool = False) -> Image.Image:
+    """Resize image to fit within max_size while maintaining aspect ratio
+    
+    fast=True gives a rough nearest-neighbour thumbnail in well under a millisecond.
+    """
     try:
-        # Calculate aspect ratio
-        aspect_ratio = image.width / image.height
-        max_width, max_height = max_size
+        new_width, new_height = get_preview_size(image.size, max_size)
         
-        # Calculate new dimensions
-        if aspect_ratio > 1:  # Landscape
-            new_width = min(max_width, image.width)
-            new_height = int(new_width / aspect_ratio)
-        else:  # Portrait
-            new_height = min(max_height, image.height)
-            new_width = int(new_height * aspect_ratio)
+        if fast:
+            return image.resize((new_width, new_height), Image.Resampling.NEAREST)
         
-        # Ensure minimum dimensions
-        new_width = max(1, new_width)
-        new_height = max(1, new_height)
+        # Bilevel images only support nearest neighbour, go through gray for a smooth preview
+        if image.mode == '1':
+            image = image.convert('L')
         
-        return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # Integer box reductions first, so LANCZOS only resamples a small image
+        return image.resize(
+            (new_width, new_height),
+            Image.Resampling.LANCZOS,
+            reducing_gap=config.PREVIEW_REDUCING_GAP
+        )
     except Exception as e:
         raise ImageProcessingError(f"Failed to resize image: {str(e)}")
 
 
+def downscale_image(image: Image.Image, factor: int) -> Image.Image:
+    """Downscale image by an integer factor using fast box reduction"""
+    try:
+        if factor <= 1:
+            return image
+        if image.mode == '1':
+            image = image.convert('L')
+        return image.reduce(factor)
+    except Exception as e:
+        raise ImageProcessingError(f"Failed to downscale image: {str(e)}")
+
+
 def convert_pil_to_ctk_image(pil_image: Image.Image) -> ctk.CTkImage:
     """Convert PIL Image to CustomTkinter image"""
     try:
@@ -71,6 +102,56 @@ def crop_image_half(image: Image.Image, top_half: bool = True) -> Image.Image:
         raise ImageProcessingError(f"Failed to crop image: {str(e)}")
 
 
+def extract_region(image: Image.Image, box: Tuple[int, int, int, int], rotation: int = 0) -> Image.Image:
+    """Crop a region and rotate it counter-clockwise by a multiple of 90 degrees"""
+    try:
+        region = image.crop(tuple(int(value) for value in box))
+        rotation %= 360
+        if rotation == 90:
+            return region.transpose(Image.Transpose.ROTATE_90)
+        if rotation == 180:
+            return region.transpose(Image.Transpose.ROTATE_180)
+        if rotation == 270:
+            return region.transpose(Image.Transpose.ROTATE_270)
+        return region
+    except Exception as e:
+        raise ImageProcessingError(f"Failed to extract region: {str(e)}")
+
+
+def transform_region(image: Image.Image, box: Tuple[int, int, int, int], rotation: int = 0,
+                     size: Optional[Tuple[int, int]] = None,
+                     reducing_gap: Optional[float] = None) -> Image.Image:
+    """Extract a region scaled to size (after rotation) with as few copies as possible
+    
+    reducing_gap is passed to Image.resize, for fast large downscales.
+    """
+    try:
+        box = tuple(int(value) for value in box)
+        region_size = (box[2] - box[0], box[3] - box[1])
+        rotation %= 360
+        
+        # Scale before rotating, so the target size is expressed pre-rotation
+        target_size = region_size
+        if size is not None:
+            target_size = (int(size[1]), int(size[0])) if rotation % 180 else (int(size[0]), int(size[1]))
+        
+        if target_size != region_size:
+            # Crop and scale in a single resampling pass
+            region = image.resize(target_size, Image.Resampling.LANCZOS, box=box, reducing_gap=reducing_gap)
+        else:
+            region = image.crop(box)
+        
+        if rotation == 90:
+            return region.transpose(Image.Transpose.ROTATE_90)
+        if rotation == 180:
+            return region.transpose(Image.Transpose.ROTATE_180)
+        if rotation == 270:
+            return region.transpose(Image.Transpose.ROTATE_270)
+        return region
+    except Exception as e:
+        raise ImageProcessingError(f"Failed to transform region: {str(e)}")
+
+
 def combine_images_vertically(top_image: Image.Image, bottom_image: Image.Image) -> Image.Image:
     """Combine two images vertically"""
     try:
@@ -89,7 +170,7 @@ def combine_images_vertically(top_image: Image.Image, bottom_image: Image.Image)
         
         # Create combined image
         combined_height = top_height + bottom_height
-        combined_image = Image.new('RGB', (target_width, combined_height), 'white')
+        combined_image = Image.new(top_image.mode, (target_width, combined_height), 'white')
         
         # Paste images
         combined_image.paste(top_image, (0, 0))
@@ -100,20 +181,69 @@ def combine_images_vertically(top_image: Image.Image, bottom_image: Image.Image)
         raise ImageProcessingError(f"Failed to combine images: {str(e)}")
 
 
+def convert_to_bilevel(image: Image.Image, threshold: int = 160, dither: bool = False) -> Image.Image:
+    """Convert image to 1-bit black and white (mode "1")"""
+    try:
+        if image.mode == '1':
+            return image
+        gray = image.convert('L')
+        if dither:
+            return gray.convert('1', dither=Image.Dither.FLOYDSTEINBERG)
+        # Hard threshold keeps barcode edges sharp
+        return gray.point(lambda value: 255 if value >= threshold else 0, mode='1')
+    except Exception as e:
+        raise ImageProcessingError(f"Failed to convert image to black and white: {str(e)}")
+
+
 def save_image_with_format(image: Image.Image, file_path: str, format_type: str, 
-                          quality: int = 100, dpi: int = 300) -> None:
-    """Save image with specified format and quality"""
+                          quality: int = 100, dpi: int = 300, append: bool = False) -> None:
+    """Save image with specified format and quality
+    
+    With append, the image is added as a new page at the end of an existing
+    PDF or TIFF file, without reading the previous pages back.
+    """
     try:
-        if format_type.upper() == "PDF":
-            image.save(file_path, 'PDF', quality=quality, resolution=float(dpi))
-        elif format_type.upper() == "PNG":
-            image.save(file_path, 'PNG', quality=quality, dpi=(dpi, dpi))
+        format_type = format_type.upper()
+        if append and format_type not in config.MULTIPAGE_FORMATS:
+            raise ImageProcessingError(f"Format {format_type} does not support multi-page documents")
+        
+        if format_type == "PDF" and image.mode == '1':
+            # Pillow writes 1-bit pages as CCITT G4, which takes no JPEG quality
+            image.save(file_path, 'PDF', resolution=float(dpi), append=append)
+        elif format_type == "PDF":
+            image.save(file_path, 'PDF', quality=quality, resolution=float(dpi), append=append)
+        elif format_type == "PNG":
+            # PNG is lossless, quality does not apply
+            image.save(file_path, 'PNG', dpi=(dpi, dpi))
+        elif format_type in ("PDF-G4", "TIFF-G4"):
+            # Pillow needs libtiff for CCITT G4, without it PDF would silently fall back to JPEG
+            if not features.check('libtiff'):
+                raise ImageProcessingError("Pillow was built without libtiff, CCITT G4 export is unavailable")
+            bilevel = convert_to_bilevel(image, config.BILEVEL_THRESHOLD, config.BILEVEL_DITHER)
+            if format_type == "PDF-G4":
+                bilevel.save(file_path, 'PDF', resolution=float(dpi), append=append)
+            elif append:
+                # Pillow's own multi-frame writer, opened on the existing file
+                with TiffImagePlugin.AppendingTiffWriter(file_path) as tiff_file:
+                    bilevel.save(tiff_file, 'TIFF', compression='group4', dpi=(dpi, dpi))
+                    tiff_file.newFrame()
+            else:
+                bilevel.save(file_path, 'TIFF', compression='group4', dpi=(dpi, dpi))
         else:
             raise ImageProcessingError(f"Unsupported format: {format_type}")
+    except ImageProcessingError:
+        raise
     except Exception as e:
         raise ImageProcessingError(f"Failed to save image: {str(e)}")
 
 
+def get_image_nbytes(image: Image.Image) -> int:
+    """Get the size of the image pixel buffer in bytes"""
+    # Pillow stores 3-band modes padded to 4 bytes per pixel
+    bytes_per_pixel = {'1': 1, 'L': 1, 'P': 1, 'LA': 4, 'RGB': 4}.get(image.mode, len(image.getbands()))
+    return image.width * image.height * bytes_per_pixel
+
+
 def get_image_info(image: Image.Image) -> dict:
     """Get image information"""
     return {